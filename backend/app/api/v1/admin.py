@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.database import get_db
 from app.api.deps import get_current_admin
-from app.schemas.admin import AdminStats
+from app.schemas.admin import AdminStats, CacheStats, UserResponse, EmployerResponse, JobResponse, ApplicationResponse
 from app.models.user import User
 from app.models.employer import Employer
 from app.models.job import Job
 from app.models.application import Application
+from typing import Dict, List, Optional
+from app.core.pagination import paginate
+from app.core.cache import job_listing_cache, job_slug_cache
+from app.core.job_events import jobs_changed
+from app.core.dashboard import invalidate_job_dashboards
+from app.core.expiry import sweep_expired_jobs
 
 router = APIRouter(
     prefix="/admin",
@@ -36,122 +42,64 @@ def get_admin_stats(
         pending_applications=pending_applications
     )
 
-
-@router.delete("/users/{user_id}")
-def delete_user(
-    user_id: str,
-    admin = Depends(get_current_admin),
-    db: Session = Depends(get_db)
-):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    db.delete(user)
-    db.commit()
-    
-    return {"message": "User deleted successfully"}
-
-
-@router.delete("/employers/{employer_id}")
-def delete_employer(
-    employer_id: str,
-    admin = Depends(get_current_admin),
-    db: Session = Depends(get_db)
-):
-    employer = db.query(Employer).filter(Employer.id == employer_id).first()
-    if not employer:
-        raise HTTPException(status_code=404, detail="Employer not found")
-    
-    db.delete(employer)
-    db.commit()
-    
-    return {"message": "Employer deleted successfully"}
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from app.database import get_db
-from app.api.deps import get_current_admin
-from app.schemas.admin import AdminStats, UserResponse, EmployerResponse, JobResponse, ApplicationResponse
-from app.models.user import User
-from app.models.employer import Employer
-from app.models.job import Job
-from app.models.application import Application
-from typing import List, Optional
-
-router = APIRouter(
-    prefix="/admin",
-    tags=["Admin"]
-)
-
-
-@router.get("/stats", response_model=AdminStats)
-def get_admin_stats(
-    admin = Depends(get_current_admin),
-    db: Session = Depends(get_db)
-):
-    total_users = db.query(func.count(User.id)).scalar()
-    total_employers = db.query(func.count(Employer.id)).scalar()
-    total_jobs = db.query(func.count(Job.id)).scalar()
-    active_jobs = db.query(func.count(Job.id)).filter(Job.status == "active").scalar()
-    total_applications = db.query(func.count(Application.id)).scalar()
-    pending_applications = db.query(func.count(Application.id)).filter(Application.status == "pending").scalar()
-    
-    return AdminStats(
-        total_users=total_users,
-        total_employers=total_employers,
-        total_jobs=total_jobs,
-        active_jobs=active_jobs,
-        total_applications=total_applications,
-        pending_applications=pending_applications
-    )
+@router.get("/cache/stats", response_model=Dict[str, CacheStats])
+def get_cache_stats(admin = Depends(get_current_admin)):
+    return {"job_listings": job_listing_cache.stats(), "job_slugs": job_slug_cache.stats()}
 
 @router.get("/users", response_model=List[UserResponse])
 def get_all_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
-    users = db.query(User).order_by(desc(User.created_at)).offset(skip).limit(limit).all()
+    users = paginate(db.query(User), User, skip, limit, cursor, response)
     return users
 
 @router.get("/employers", response_model=List[EmployerResponse])
 def get_all_employers(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
-    employers = db.query(Employer).order_by(desc(Employer.created_at)).offset(skip).limit(limit).all()
+    employers = paginate(db.query(Employer), Employer, skip, limit, cursor, response)
     return employers
 
 @router.get("/jobs", response_model=List[JobResponse])
 def get_all_jobs(
+    response: Response,
     status: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     query = db.query(Job)
     if status:
         query = query.filter(Job.status == status)
-    jobs = query.order_by(desc(Job.created_at)).offset(skip).limit(limit).all()
+    jobs = paginate(query, Job, skip, limit, cursor, response)
     return jobs
 
 @router.get("/applications", response_model=List[ApplicationResponse])
 def get_all_applications(
+    response: Response,
     status: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     query = db.query(Application)
     if status:
         query = query.filter(Application.status == status)
-    applications = query.order_by(desc(Application.created_at)).offset(skip).limit(limit).all()
+    applications = paginate(query, Application, skip, limit, cursor, response)
     return applications
 
 @router.delete("/users/{user_id}")
@@ -165,10 +113,12 @@ def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
     
     # also delete user's applications
+    job_ids = [row.job_id for row in db.query(Application.job_id).filter(Application.user_id == user_id)]
     db.query(Application).filter(Application.user_id == user_id).delete()
     
     db.delete(user)
     db.commit()
+    invalidate_job_dashboards(job_ids)
     
     return {"message": "User deleted successfully"}
 
@@ -185,12 +135,14 @@ def delete_employer(
     
     # also delete employer's jobs and associated applications
     jobs = db.query(Job).filter(Job.employer_id == employer_id).all()
+    job_ids = [job.id for job in jobs]
     for job in jobs:
         db.query(Application).filter(Application.job_id == job.id).delete()
         db.delete(job)
     
     db.delete(employer)
     db.commit()
+    jobs_changed(db, job_ids)
     
     return {"message": "Employer deleted successfully"}
 
@@ -209,9 +161,15 @@ def delete_job(
     
     db.delete(job)
     db.commit()
+    jobs_changed(db, [job_id])
     
     return {"message": "Job deleted successfully"}
 
+@router.post("/jobs/close-expired")
+def close_expired_jobs_now(admin = Depends(get_current_admin)):
+    closed = sweep_expired_jobs()
+    return {"message": f"Closed {closed} expired jobs", "closed": closed}
+
 @router.patch("/jobs/{job_id}/status")
 def update_job_status(
     job_id: str,
@@ -228,6 +186,7 @@ def update_job_status(
     
     job.status = status
     db.commit()
+    jobs_changed(db, [job_id])
     db.refresh(job)
     
     return {"message": f"Job status updated to {status}", "job": job}
@@ -1,14 +1,21 @@
-from typing import List
+import uuid
+from typing import List, Optional
 from datetime import datetime, timezone
+from sqlalchemy import DateTime, String, case, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from app.config import settings
 from app.api.deps import get_current_employer, get_current_user
-from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationResponse, ApplicationDetailResponse
+from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationResponse, ApplicationDetailResponse, ApplicationBulkStatusUpdate, ApplicationBulkStatusResponse
 from app.models.application import Application
 from app.models.job import Job
 from app.database import get_db
 from app.models.user import User
 from app.models.employer import Employer
+from app.core.pagination import paginate
+from app.core.events import publish_application_status
+from app.core.dashboard import invalidate_employer_dashboard, invalidate_job_dashboards
 
 router = APIRouter(
     prefix="/applications",
@@ -21,77 +28,99 @@ def create_application(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db)):
     
-    job = db.query(Job).filter(Job.id == app_data.job_id).first()
+    now = datetime.now(timezone.utc)
+    application_id = str(uuid.uuid4())
+
+    # Insert only if the job is open, checking status and deadline in the same statement
+    open_job = select(
+        literal(application_id, String),
+        literal(user.id, String),
+        Job.id,
+        literal("pending", String),
+        literal(now, DateTime)
+    ).where(
+        Job.id == app_data.job_id,
+        Job.status == "active",
+        or_(Job.application_deadline.is_(None), Job.application_deadline >= now)
+    )
 
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.application_deadline:
-        deadline = job.application_deadline
-        if deadline.tzinfo is None:
-            deadline = deadline.replace(tzinfo=timezone.utc)
+    try:
+        inserted = db.execute(
+            insert(Application).from_select(
+                ["id", "user_id", "job_id", "status", "created_at"], open_job
+            )
+        ).rowcount
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="You have already applied to this job")
 
-    if deadline < datetime.now(timezone.utc):
-        raise HTTPException(status_code=400, detail="Application deadline has passed")
-    
-    existing = db.query(Application).filter(Application.user_id == user.id, Application.job_id == job.id).first()
+    if not inserted:
+        # Only the rejected path pays for a second read, to say why
+        job = db.query(Job.status, Job.application_deadline).filter(Job.id == app_data.job_id).first()
 
-    if existing:
-        raise HTTPException(status_code=400, detail="You have already applied to this job")
-    
-    new_application = Application(
-        user_id=user.id,
-        job_id=job.id,
-        status="pending"
-    )
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
 
-    db.add(new_application)
-    db.commit()
-    db.refresh(new_application)
+        if job.status == "active":
+            raise HTTPException(status_code=400, detail="Application deadline has passed")
+
+        raise HTTPException(status_code=400, detail="Job is no longer accepting applications")
+
+    invalidate_job_dashboards([app_data.job_id])
+
+    return {
+        "id": application_id,
+        "user_id": user.id,
+        "job_id": app_data.job_id,
+        "status": "pending",
+        "created_at": now
+    }
 
-    return new_application
+
+def build_application_detail_query(db: Session):
+    """Applications joined to their applicant and job, projected to the detail fields in one query"""
+
+    return db.query(
+        Application.id,
+        Application.user_id,
+        Application.job_id,
+        Application.status,
+        Application.created_at,
+        User.first_name.label("user_first_name"),
+        User.last_name.label("user_last_name"),
+        User.phone_number.label("user_phone"),
+        User.email.label("user_email"),
+        Job.title.label("job_title"),
+        Job.employer_name.label("job_company")
+    ).join(User, User.id == Application.user_id).join(Job, Job.id == Application.job_id)
 
 
 @router.get("/my-applications", response_model=List[ApplicationDetailResponse])
 def get_my_applications(
+    response: Response,
     status: str = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Application).filter(Application.user_id == user.id)
+    query = build_application_detail_query(db).filter(Application.user_id == user.id)
 
     if status:
         query = query.filter(Application.status == status)
     
-    query = query.order_by(Application.created_at.desc())
-    applications = query.offset(skip).limit(limit).all()
-
-    result = []
-
-    for app in applications:
-        job = db.query(Job).filter(Job.id == app.job_id).first()
-        employer = db.query(Employer).filter(Employer.id == job.employer_id).first()
-
-        result.append({
-            **app.__dict__,
-            "user_first_name": user.first_name,
-            "user_last_name": user.last_name,
-            "user_phone": user.phone_number,
-            "user_email": user.email,
-            "job_title": job.title,
-            "job_company": employer.company_name
-        })
-    
-    return result
+    return paginate(query, Application, skip, limit, cursor, response)
 
 @router.get("/job/{job_id}", response_model=List[ApplicationDetailResponse])
 def get_job_applications(
+    response: Response,
     job_id: str,
     status: str = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     employer: Employer = Depends(get_current_employer),
     db: Session = Depends(get_db)
 ):
@@ -103,29 +132,12 @@ def get_job_applications(
     if job.employer_id != employer.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    query = db.query(Application).filter(Application.job_id == job_id)
+    query = build_application_detail_query(db).filter(Application.job_id == job_id)
     
     if status:
         query = query.filter(Application.status == status)
     
-    query = query.order_by(Application.created_at.desc())
-    applications = query.offset(skip).limit(limit).all()
-    
-    result = []
-    for app in applications:
-        user = db.query(User).filter(User.id == app.user_id).first()
-        
-        result.append({
-            **app.__dict__,
-            "user_first_name": user.first_name,
-            "user_last_name": user.last_name,
-            "user_phone": user.phone_number,
-            "user_email": user.email,
-            "job_title": job.title,
-            "job_company": employer.company_name
-        })
-    
-    return result
+    return paginate(query, Application, skip, limit, cursor, response)
 
 
 @router.patch("/{application_id}/status", response_model=ApplicationResponse)
@@ -149,184 +161,70 @@ def update_application_status(
     
     db.commit()
     db.refresh(application)
+
+    invalidate_employer_dashboard(employer.id)
+    publish_application_status(application.user_id, application.id, application.job_id, application.status)
     
     return application
 
 
-@router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
-def withdraw_application(
-    application_id: str,
-    user: User = Depends(get_current_user),
+@router.patch("/status/bulk", response_model=ApplicationBulkStatusResponse)
+def bulk_update_application_status(
+    update_data: ApplicationBulkStatusUpdate,
+    employer: Employer = Depends(get_current_employer),
     db: Session = Depends(get_db)
 ):
-    application = db.query(Application).filter(Application.id == application_id).first()
-    
-    if not application:
-        raise HTTPException(status_code=404, detail="Application not found")
-    
-    if application.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    if application.status not in ["pending", "reviewing"]:
-        raise HTTPException(status_code=400, detail=f"Cannot withdraw application with status: {application.status}")
-    
-    db.delete(application)
-    db.commit()
-    
-    return None
-from typing import List
-from datetime import datetime, timezone
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from app.api.deps import get_current_employer, get_current_user
-from app.schemas.application import ApplicationCreate, ApplicationUpdate, ApplicationResponse, ApplicationDetailResponse
-from app.models.application import Application
-from app.models.job import Job
-from app.database import get_db
-from app.models.user import User
-from app.models.employer import Employer
+    """Set the status of many applications at once, optionally rejecting the other pending applicants"""
 
-router = APIRouter(
-    prefix="/applications",
-    tags=["Applications"]
-)
-
-@router.post("", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
-def create_application(
-    app_data: ApplicationCreate,
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)):
-    
-    job = db.query(Job).filter(Job.id == app_data.job_id).first()
+    if not update_data.changes:
+        raise HTTPException(status_code=400, detail="No applications given")
 
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.application_deadline:
-        deadline = job.application_deadline
-        if deadline.tzinfo is None:
-            deadline = deadline.replace(tzinfo=timezone.utc)
+    if len(update_data.changes) > settings.APPLICATION_BULK_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.APPLICATION_BULK_MAX_ROWS} applications can be updated at once")
 
-    if deadline < datetime.now(timezone.utc):
-        raise HTTPException(status_code=400, detail="Application deadline has passed")
-    
-    existing = db.query(Application).filter(Application.user_id == user.id, Application.job_id == job.id).first()
+    statuses = {change.application_id: change.status for change in update_data.changes}
+    if len(statuses) != len(update_data.changes):
+        raise HTTPException(status_code=400, detail="Each application can only be listed once")
 
-    if existing:
-        raise HTTPException(status_code=400, detail="You have already applied to this job")
-    
-    new_application = Application(
-        user_id=user.id,
-        job_id=job.id,
-        status="pending"
-    )
+    # One join checks every application exists and belongs to one of this employer's jobs
+    owned = db.query(Application.id, Application.user_id, Application.job_id).join(Job, Job.id == Application.job_id).filter(
+        Application.id.in_(statuses),
+        Job.employer_id == employer.id
+    ).all()
 
-    db.add(new_application)
-    db.commit()
-    db.refresh(new_application)
-
-    return new_application
-
-
-@router.get("/my-applications", response_model=List[ApplicationDetailResponse])
-def get_my_applications(
-    status: str = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100),
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    query = db.query(Application).filter(Application.user_id == user.id)
+    if len(owned) != len(statuses):
+        raise HTTPException(status_code=404, detail="Application not found")
 
-    if status:
-        query = query.filter(Application.status == status)
-    
-    query = query.order_by(Application.created_at.desc())
-    applications = query.offset(skip).limit(limit).all()
-
-    result = []
-
-    for app in applications:
-        job = db.query(Job).filter(Job.id == app.job_id).first()
-        employer = db.query(Employer).filter(Employer.id == job.employer_id).first()
-
-        result.append({
-            **app.__dict__,
-            "user_first_name": user.first_name,
-            "user_last_name": user.last_name,
-            "user_phone": user.phone_number,
-            "user_email": user.email,
-            "job_title": job.title,
-            "job_company": employer.company_name
-        })
-    
-    return result
+    updated = db.execute(
+        update(Application)
+        .where(Application.id.in_(statuses))
+        .values(status=case(statuses, value=Application.id)),
+        execution_options={"synchronize_session": False}
+    ).rowcount
+
+    rejected = []
+    if update_data.reject_remaining:
+        rejected = db.execute(
+            update(Application)
+            .where(
+                Application.job_id.in_({row.job_id for row in owned}),
+                Application.status == "pending",
+                Application.id.notin_(statuses)
+            )
+            .values(status="rejected")
+            .returning(Application.id, Application.user_id, Application.job_id),
+            execution_options={"synchronize_session": False}
+        ).all()
 
-@router.get("/job/{job_id}", response_model=List[ApplicationDetailResponse])
-def get_job_applications(
-    job_id: str,
-    status: str = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100),
-    employer: Employer = Depends(get_current_employer),
-    db: Session = Depends(get_db)
-):
-    job = db.query(Job).filter(Job.id == job_id).first()
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.employer_id != employer.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    query = db.query(Application).filter(Application.job_id == job_id)
-    
-    if status:
-        query = query.filter(Application.status == status)
-    
-    query = query.order_by(Application.created_at.desc())
-    applications = query.offset(skip).limit(limit).all()
-    
-    result = []
-    for app in applications:
-        user = db.query(User).filter(User.id == app.user_id).first()
-        
-        result.append({
-            **app.__dict__,
-            "user_first_name": user.first_name,
-            "user_last_name": user.last_name,
-            "user_phone": user.phone_number,
-            "user_email": user.email,
-            "job_title": job.title,
-            "job_company": employer.company_name
-        })
-    
-    return result
+    db.commit()
 
+    invalidate_employer_dashboard(employer.id)
+    for row in owned:
+        publish_application_status(row.user_id, row.id, row.job_id, statuses[row.id])
+    for row in rejected:
+        publish_application_status(row.user_id, row.id, row.job_id, "rejected")
 
-@router.patch("/{application_id}/status", response_model=ApplicationResponse)
-def update_application_status(
-    application_id: str,
-    update_data: ApplicationUpdate,
-    employer: Employer = Depends(get_current_employer),
-    db: Session = Depends(get_db)
-):
-    application = db.query(Application).filter(Application.id == application_id).first()
-    
-    if not application:
-        raise HTTPException(status_code=404, detail="Application not found")
-    
-    job = db.query(Job).filter(Job.id == application.job_id).first()
-    
-    if job.employer_id != employer.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    application.status = update_data.status
-    
-    db.commit()
-    db.refresh(application)
-    
-    return application
+    return {"updated": updated, "rejected": len(rejected)}
 
 
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -346,7 +244,10 @@ def withdraw_application(
     if application.status not in ["pending", "reviewing"]:
         raise HTTPException(status_code=400, detail=f"Cannot withdraw application with status: {application.status}")
     
+    job_id = application.job_id
     db.delete(application)
     db.commit()
+
+    invalidate_job_dashboards([job_id])
     
-    return None
\ No newline at end of file
+    return None
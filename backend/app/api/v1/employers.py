@@ -1,8 +1,14 @@
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends
-from app.schemas.employer import EmployerResponse, EmployerUpdate
+from app.schemas.employer import EmployerResponse, EmployerUpdate, EmployerDashboard, EmployerDashboardJob, EmployerPayroll
 from app.models.employer import Employer
+from app.models.job import Job
+from app.models.work_tracking import WorkSession
 from app.api.deps import get_current_employer
 from app.database import get_db
+from app.core.cache import bump_jobs_version
+from app.core.dashboard import employer_dashboard_cache, cache_dashboard, dashboard_generation
+from app.core.aggregates import count_where, sum_where
 from sqlalchemy.orm import Session
 
 router = APIRouter(
@@ -24,37 +30,93 @@ def update_employer_profile(
     for field, value in update_data.items():
         setattr(employer, field, value)
     
+    # Keep the denormalized name on the employer's jobs in step (this also moves their ETags)
+    if "company_name" in update_data:
+        db.query(Job).filter(Job.employer_id == employer.id).update(
+            {Job.employer_name: employer.company_name, Job.updated_at: datetime.now(timezone.utc)},
+            synchronize_session=False
+        )
+
     db.commit()
+
+    if "company_name" in update_data:
+        bump_jobs_version()
+
     db.refresh(employer)
     
     return employer
-from fastapi import APIRouter, Depends
-from app.schemas.employer import EmployerResponse, EmployerUpdate
-from app.models.employer import Employer
-from app.api.deps import get_current_employer
-from app.database import get_db
-from sqlalchemy.orm import Session
 
-router = APIRouter(
-    prefix="/employers",
-    tags=["Employers"]
-)
 
-@router.get("/me", response_model=EmployerResponse)
-def get_current_employer_profile(employer: Employer = Depends(get_current_employer)):
-    return employer
+def build_employer_dashboard(db: Session, employer_id: str) -> EmployerDashboard:
+    """Jobs with their application counters plus work-session and payroll totals, in two queries"""
 
-@router.patch("/me", response_model=EmployerResponse)
-def update_employer_profile(
-    employer_data: EmployerUpdate,
+    jobs = db.query(
+        Job.id, Job.title, Job.slug, Job.status, Job.created_at, Job.application_deadline,
+        Job.pending_applications, Job.reviewing_applications,
+        Job.accepted_applications, Job.rejected_applications
+    ).filter(Job.employer_id == employer_id).order_by(Job.created_at.desc(), Job.id.desc()).all()
+
+    in_progress = WorkSession.state == "active"
+    awaiting_start = WorkSession.state == "pending_start"
+    awaiting_end = WorkSession.state == "pending_end"
+    approved = WorkSession.state == "completed"
+
+    sessions = {
+        row.job_id: row
+        for row in db.query(
+            WorkSession.job_id,
+            count_where(in_progress).label("active_sessions"),
+            count_where(awaiting_start).label("pending_start_approval"),
+            count_where(awaiting_end).label("pending_end_approval"),
+            count_where(approved).label("approved_sessions"),
+            sum_where(approved, WorkSession.daily_payment).label("total_paid"),
+            sum_where(approved, WorkSession.hours_worked).label("total_hours"),
+            sum_where(awaiting_end, WorkSession.daily_payment).label("pending_payment")
+        ).filter(WorkSession.employer_id == employer_id).group_by(WorkSession.job_id)
+    }
+
+    dashboard_jobs = []
+    for job in jobs:
+        session = sessions.get(job.id)
+        dashboard_jobs.append(EmployerDashboardJob(
+            **job._asdict(),
+            active_sessions=session.active_sessions if session else 0,
+            pending_start_approval=session.pending_start_approval if session else 0,
+            pending_end_approval=session.pending_end_approval if session else 0
+        ))
+
+    def total(rows, field):
+        return sum(getattr(row, field) for row in rows)
+
+    return EmployerDashboard(
+        jobs=dashboard_jobs,
+        pending_applications=total(jobs, "pending_applications"),
+        reviewing_applications=total(jobs, "reviewing_applications"),
+        accepted_applications=total(jobs, "accepted_applications"),
+        rejected_applications=total(jobs, "rejected_applications"),
+        active_sessions=total(sessions.values(), "active_sessions"),
+        pending_start_approval=total(sessions.values(), "pending_start_approval"),
+        pending_end_approval=total(sessions.values(), "pending_end_approval"),
+        payroll=EmployerPayroll(
+            approved_sessions=total(sessions.values(), "approved_sessions"),
+            total_paid=total(sessions.values(), "total_paid"),
+            total_hours=total(sessions.values(), "total_hours"),
+            pending_payment=total(sessions.values(), "pending_payment")
+        )
+    )
+
+
+@router.get("/me/dashboard", response_model=EmployerDashboard)
+def get_employer_dashboard(
     employer: Employer = Depends(get_current_employer),
     db: Session = Depends(get_db)
 ):
-    update_data = employer_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(employer, field, value)
-    
-    db.commit()
-    db.refresh(employer)
-    
-    return employer
\ No newline at end of file
+    dashboard = employer_dashboard_cache.get(employer.id)
+
+    if dashboard is None:
+        # Read first: a write committing while the dashboard is built moves the generation on
+        generation = dashboard_generation(employer.id)
+        dashboard = build_employer_dashboard(db, employer.id)
+        cache_dashboard(employer.id, dashboard, generation)
+
+    return dashboard
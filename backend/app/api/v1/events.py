@@ -0,0 +1,93 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import SessionLocal
+from app.api.deps import security
+from app.core.security import decode_token, create_stream_ticket
+from app.schemas.auth import StreamTicketResponse
+from app.core.events import event_hub
+from app.models.user import User
+from app.models.employer import Employer
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+PRINCIPAL_MODELS = {"user": User, "employer": Employer}
+
+
+def authenticate_principal(token: str, token_type: str):
+    """(principal_type, principal_id) of a worker or employer token of the given type"""
+
+    payload = decode_token(token)
+    principal_type = payload.get("user_type") if payload else None
+
+    if principal_type not in PRINCIPAL_MODELS or payload.get("type") != token_type:
+        raise HTTPException(status_code=401, detail="Invalid authentication")
+
+    # A short-lived session: a stream stays open for minutes and must not hold a pooled connection
+    model = PRINCIPAL_MODELS[principal_type]
+    with SessionLocal() as db:
+        exists = db.query(model.id).filter(model.id == payload.get("sub")).first()
+
+    if not exists:
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    return principal_type, payload.get("sub")
+
+
+async def stream_events(request: Request, principal_type: str, principal_id: str):
+    # Subscribe here rather than in the route: if the client goes away before the
+    # body is first read, this generator never starts and nothing is left in the hub
+    subscriber = event_hub.subscribe(principal_type, principal_id)
+    try:
+        yield "retry: 5000\n\n"
+
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Comment frame: keeps proxies from timing out the idle connection
+                message = ": heartbeat\n\n"
+
+            yield message
+    finally:
+        event_hub.unsubscribe(subscriber)
+
+
+@router.post("/ticket", response_model=StreamTicketResponse)
+def create_event_ticket(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Short-lived ticket for /events/stream
+
+    EventSource cannot send an Authorization header, so the stream takes a
+    ticket in its URL instead of the access token, which would otherwise end up
+    in access and proxy logs.
+    """
+
+    principal_type, principal_id = authenticate_principal(credentials.credentials, "access")
+    ticket = create_stream_ticket({"sub": principal_id, "user_type": principal_type})
+
+    return {"ticket": ticket, "expires_in": settings.STREAM_TICKET_EXPIRE_SECONDS}
+
+
+@router.get("/stream")
+async def event_stream(request: Request, ticket: str = Query(...)):
+    """Server-sent events for the signed-in worker or employer
+
+    Takes a ticket from POST /events/ticket. Events: application.status,
+    work_session.updated and resync (events were dropped; refetch).
+    """
+
+    principal_type, principal_id = await run_in_threadpool(authenticate_principal, ticket, "stream")
+
+    return StreamingResponse(
+        stream_events(request, principal_type, principal_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
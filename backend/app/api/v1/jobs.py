@@ -1,14 +1,30 @@
+import csv
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import codecs
+from datetime import datetime, timezone
+from fastapi import APIRouter, Body, Depends, File, Header, HTTPException, Response, UploadFile, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-from typing import List, Optional
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import or_, case, func, insert, table, column, literal_column
+from typing import Any, Dict, Iterable, List, Optional
+from app.config import settings
 from app.database import get_db
-from app.api.deps import get_current_employer
-from app.schemas.job import JobCreate, JobUpdate, JobResponse, JobDetailResponse
+from app.api.deps import get_current_employer, get_current_user
+from app.schemas.job import JobCreate, JobUpdate, JobResponse, JobDetailResponse, EmployerJobResponse, JobFacets, JobBulkCreateResponse, JobBulkRowError, JobSuggestion
 from app.models.job import Job
+from app.models.job_facet import JobFacetCount
 from app.models.employer import Employer
+from app.models.user import User
 from app.core.utils import generate_job_slug
+from app.core.search import fts_enabled, trigram_enabled, build_match_query
+from app.core.fuzzy import FUZZY_MIN_SIMILARITY, FUZZY_CANDIDATE_LIMIT, CATEGORY_MATCH_WEIGHT, trigrams, words_of, best_word_similarity, build_trigram_match, match_categories
+from app.core.pagination import NEXT_CURSOR_HEADER, page_query, paginate, next_cursor_for
+from app.core.cache import job_listing_cache, job_slug_cache, get_jobs_version
+from app.core.job_events import jobs_changed
+from app.core.etag import make_etag, etag_matches
+from app.core.geo import DISTRICT_HOPS, parse_radius, districts_near
+from app.core.recommendations import job_feature_matrix, build_worker_profile
+from app.core.suggest import suggest_index
 
 
 router = APIRouter(
@@ -16,6 +32,14 @@ router = APIRouter(
     tags=["Jobs"]
 )
 
+jobs_fts = table("jobs_fts", column("rowid"), column("rank"))
+jobs_trigram = table("jobs_trigram", column("rowid"), column("rank"))
+job_list_adapter = TypeAdapter(List[JobResponse])
+
+# Listings may be a few seconds stale on the client; a job page is always revalidated
+LIST_CACHE_CONTROL = "public, max-age=15"
+DETAIL_CACHE_CONTROL = "public, no-cache"
+
 
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 def create_job(job_data: JobCreate, employer: Employer = Depends(get_current_employer), db: Session = Depends(get_db)):
@@ -25,6 +49,7 @@ def create_job(job_data: JobCreate, employer: Employer = Depends(get_current_emp
     new_job = Job(
         id=job_id,
         employer_id=employer.id,
+        employer_name=employer.company_name,
         title=job_data.title,
         slug=slug,
         description=job_data.description,
@@ -37,20 +62,99 @@ def create_job(job_data: JobCreate, employer: Employer = Depends(get_current_emp
 
     db.add(new_job)
     db.commit()
+    jobs_changed(db, [job_id])
     db.refresh(new_job)
 
     return new_job
 
 
-@router.get("", response_model=List[JobResponse])
-def list_jobs(
+def bulk_create_jobs(rows: Iterable[Dict[str, Any]], employer: Employer, db: Session, atomic: bool) -> JobBulkCreateResponse:
+    """Validate rows one by one and insert the valid ones with a single executemany"""
+
+    new_jobs, errors = [], []
+    now = datetime.now(timezone.utc)
+
+    for row_number, row in enumerate(rows, start=1):
+        if row_number > settings.JOB_BULK_MAX_ROWS:
+            raise HTTPException(status_code=400, detail=f"At most {settings.JOB_BULK_MAX_ROWS} jobs can be posted at once")
+
+        try:
+            job_data = JobCreate.model_validate(row)
+        except ValidationError as exc:
+            errors.append(JobBulkRowError(
+                row=row_number,
+                errors=[f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()]
+            ))
+            continue
+
+        job_id = str(uuid.uuid4())
+        new_jobs.append({
+            "id": job_id,
+            "employer_id": employer.id,
+            "employer_name": employer.company_name,
+            "title": job_data.title,
+            "slug": generate_job_slug(job_data.title, job_id),
+            "description": job_data.description,
+            "category": job_data.category,
+            "district": job_data.district,
+            "salary": job_data.salary,
+            "application_deadline": job_data.application_deadline,
+            "status": "active",
+            "created_at": now,
+            "updated_at": now
+        })
+
+    if atomic and errors:
+        new_jobs = []
+
+    if new_jobs:
+        db.execute(insert(Job), new_jobs)
+        db.commit()
+        jobs_changed(db, [job["id"] for job in new_jobs])
+
+    return JobBulkCreateResponse(
+        created=len(new_jobs),
+        job_ids=[job["id"] for job in new_jobs],
+        errors=errors
+    )
+
+
+@router.post("/bulk", response_model=JobBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_jobs_bulk(
+    rows: List[Dict[str, Any]] = Body(...),
+    atomic: bool = False,
+    employer: Employer = Depends(get_current_employer),
+    db: Session = Depends(get_db)
+):
+    """Post many jobs at once; errors are reported per row (1-based) and, with atomic, nothing is inserted if any row fails"""
+    return bulk_create_jobs(rows, employer, db, atomic)
+
+
+@router.post("/bulk/csv", response_model=JobBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_jobs_bulk_csv(
+    file: UploadFile = File(...),
+    atomic: bool = False,
+    employer: Employer = Depends(get_current_employer),
+    db: Session = Depends(get_db)
+):
+    """Same as /jobs/bulk for a CSV upload whose header row names the JobCreate fields"""
+
+    # Decode the spooled upload line by line instead of reading it into memory
+    reader = csv.DictReader(codecs.iterdecode(file.file, "utf-8-sig"))
+    rows = ({field: value or None for field, value in row.items()} for row in reader)
+
+    try:
+        return bulk_create_jobs(rows, employer, db, atomic)
+    except (UnicodeDecodeError, csv.Error):
+        raise HTTPException(status_code=400, detail="File must be a UTF-8 encoded CSV")
+
+
+def build_list_query(
+    db: Session,
+    status: str = "active",
     category: Optional[str] = None,
     district: Optional[str] = None,
-    min_salary: Optional[int] = None,
-    status: str = "active",
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    min_salary: Optional[int] = None
 ):
     query = db.query(Job).filter(Job.status == status)
 
@@ -63,26 +167,32 @@ def list_jobs(
     if min_salary:
         query = query.filter(Job.salary >= min_salary)
 
-    query = query.order_by(Job.created_at.desc())
-    return query.offset(skip).limit(limit).all()
+    return query
 
 
-@router.get("/search", response_model=List[JobResponse])
-def search_jobs(
-    q: str = Query(..., min_length=2),
+def build_search_query(
+    db: Session,
+    q: str,
     district: Optional[str] = None,
-    category: Optional[str] = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    category: Optional[str] = None
 ):
+    """Ranked search query for active jobs, or None when q has no searchable terms"""
+
     query = db.query(Job).filter(Job.status == "active")
-    
-    search_filter = or_(
-        Job.title.ilike(f"%{q}%"),
-        Job.description.ilike(f"%{q}%")
-    )
-    query = query.filter(search_filter)
+
+    if fts_enabled():
+        match = build_match_query(q)
+        if not match:
+            return None
+
+        query = query.join(jobs_fts, jobs_fts.c.rowid == literal_column("jobs.rowid"))
+        query = query.filter(literal_column("jobs_fts").op("MATCH")(match))
+    else:
+        search_filter = or_(
+            Job.title.ilike(f"%{q}%"),
+            Job.description.ilike(f"%{q}%")
+        )
+        query = query.filter(search_filter)
     
     if district:
         query = query.filter(Job.district == district)
@@ -90,40 +200,312 @@ def search_jobs(
     if category:
         query = query.filter(Job.category == category)
     
-    query = query.order_by(Job.created_at.desc())
+    if fts_enabled():
+        # rank is bm25 weighted towards title matches
+        return query.order_by(jobs_fts.c.rank)
+    return query.order_by(Job.created_at.desc(), Job.id.desc())
+
+
+def build_trigram_query(
+    db: Session,
+    q: str,
+    district: Optional[str] = None,
+    category: Optional[str] = None
+):
+    """Active jobs sharing trigrams with q, best bm25 first, or None when q has no trigrams"""
+
+    match = build_trigram_match(q)
+    if not match:
+        return None
+
+    query = db.query(Job).filter(Job.status == "active")
+    query = query.join(jobs_trigram, jobs_trigram.c.rowid == literal_column("jobs.rowid"))
+    query = query.filter(literal_column("jobs_trigram").op("MATCH")(match))
+
+    if district:
+        query = query.filter(Job.district == district)
+
+    if category:
+        query = query.filter(Job.category == category)
+
+    return query.order_by(jobs_trigram.c.rank)
+
+
+def build_employer_jobs_query(db: Session, employer_id: str, status: Optional[str] = None):
+    query = db.query(Job).filter(Job.employer_id == employer_id)
+    
+    if status:
+        query = query.filter(Job.status == status)
+
+    return query
+
+
+@router.get("", response_model=List[JobResponse])
+def list_jobs(
+    category: Optional[str] = None,
+    district: Optional[str] = None,
+    min_salary: Optional[int] = None,
+    status: str = "active",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    near: Optional[str] = Query(None, description="District to search around, ranked by distance then recency"),
+    radius: str = Query("1", description="Radius around near: hops between districts ('2') or kilometres ('25km')"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    near_radius = None
+    if near:
+        if near not in DISTRICT_HOPS:
+            raise HTTPException(status_code=400, detail="Unknown district")
+        if district or cursor:
+            raise HTTPException(status_code=400, detail="near cannot be combined with district or cursor")
+        try:
+            near_radius = parse_radius(radius)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid radius")
+
+    # skip is ignored in cursor mode and a zero min_salary is no filter at all
+    key = (
+        "list", get_jobs_version(), status, category or None, district or None,
+        min_salary or None, 0 if cursor else skip, limit, cursor, near, near_radius
+    )
+    headers = {"ETag": make_etag(*key), "Cache-Control": LIST_CACHE_CONTROL}
+
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    cached = job_listing_cache.get(key)
+
+    if cached is None:
+        if near:
+            distances = districts_near(near, *near_radius)
+            query = build_list_query(db, status, category, None, min_salary).filter(Job.district.in_(distances))
+            query = query.order_by(case(distances, value=Job.district), Job.created_at.desc(), Job.id.desc())
+            jobs = query.offset(skip).limit(limit).all()
+            next_cursor = None
+        else:
+            query = build_list_query(db, status, category, district, min_salary)
+            jobs = page_query(query, Job, skip, limit, cursor).all()
+            next_cursor = next_cursor_for(jobs, limit)
+
+        body = job_list_adapter.dump_json(job_list_adapter.validate_python(jobs, from_attributes=True))
+        cached = (body, next_cursor)
+        job_listing_cache.set(key, cached)
+
+    body, next_cursor = cached
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/search", response_model=List[JobResponse])
+def search_jobs(
+    q: str = Query(..., min_length=2),
+    district: Optional[str] = None,
+    category: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    query = build_search_query(db, q, district, category)
+    if query is None:
+        return []
+
     return query.offset(skip).limit(limit).all()
 
 
+@router.get("/search/fuzzy", response_model=List[JobResponse])
+def fuzzy_search_jobs(
+    q: str = Query(..., min_length=2),
+    district: Optional[str] = None,
+    category: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Typo-tolerant search over titles and multilingual category synonyms, most similar first"""
+
+    if not trigram_enabled():
+        query = build_search_query(db, q, district, category)
+        return [] if query is None else query.offset(skip).limit(limit).all()
+
+    # Candidates only ever come from the trigram index and the category indexes
+    candidates = {}
+
+    trigram_query = build_trigram_query(db, q, district, category)
+    if trigram_query is not None:
+        for job in trigram_query.limit(FUZZY_CANDIDATE_LIMIT):
+            candidates[job.id] = job
+
+    categories = match_categories(q)
+    for name in categories:
+        if category and name != category:
+            continue
+        query = build_list_query(db, "active", name, district)
+        for job in page_query(query, Job, 0, FUZZY_CANDIDATE_LIMIT, None):
+            candidates.setdefault(job.id, job)
+
+    query_grams = [trigrams(word) for word in words_of(q)]
+    scored = []
+    for job in candidates.values():
+        score = max(best_word_similarity(query_grams, job.title), CATEGORY_MATCH_WEIGHT * categories.get(job.category, 0.0))
+        if score >= FUZZY_MIN_SIMILARITY:
+            scored.append((score, job))
+
+    # Newest first among equally similar jobs
+    scored.sort(key=lambda item: (item[1].created_at, item[1].id), reverse=True)
+    scored.sort(key=lambda item: item[0], reverse=True)
+
+    return [job for _, job in scored[skip:skip + limit]]
+
+
+@router.get("/facets", response_model=JobFacets)
+def get_job_facets(
+    category: Optional[str] = None,
+    district: Optional[str] = None,
+    min_salary: Optional[int] = None,
+    status: str = "active",
+    db: Session = Depends(get_db)
+):
+    """Job counts per category and per district; each facet applies every filter but its own"""
+
+    key = ("facets", get_jobs_version(), status, category or None, district or None, min_salary or None)
+    facets = job_listing_cache.get(key)
+
+    if facets is None:
+        if min_salary:
+            # Salary ranges are not pre-counted, so group the matching jobs instead
+            categories = build_list_query(db, status, None, district, min_salary).with_entities(
+                Job.category, func.count(Job.id)
+            ).group_by(Job.category).all()
+            districts = build_list_query(db, status, category, None, min_salary).with_entities(
+                Job.district, func.count(Job.id)
+            ).group_by(Job.district).all()
+        else:
+            counts = db.query(JobFacetCount.category, JobFacetCount.district, JobFacetCount.count).filter(
+                JobFacetCount.status == status,
+                JobFacetCount.count > 0
+            ).all()
+
+            category_counts, district_counts = {}, {}
+            for row in counts:
+                if not district or row.district == district:
+                    category_counts[row.category] = category_counts.get(row.category, 0) + row.count
+                if not category or row.category == category:
+                    district_counts[row.district] = district_counts.get(row.district, 0) + row.count
+
+            categories, districts = category_counts.items(), district_counts.items()
+
+        facets = JobFacets(
+            categories=dict(sorted(categories, key=lambda item: -item[1])),
+            districts=dict(sorted(districts, key=lambda item: -item[1]))
+        )
+        job_listing_cache.set(key, facets)
+
+    return facets
+
+
+@router.get("/suggest", response_model=List[JobSuggestion])
+def suggest_jobs(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    db: Session = Depends(get_db)
+):
+    """Typeahead for the search box over active job titles and categories"""
+
+    suggest_index.ensure_built(db)
+    return suggest_index.suggest(prefix, limit)
+
+
+@router.get("/recommended", response_model=List[JobResponse])
+def get_recommended_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Active jobs ranked for the current worker"""
+
+    job_feature_matrix.ensure_built(db)
+    profile = build_worker_profile(db, user, job_feature_matrix)
+    job_ids = job_feature_matrix.top_k(profile, limit)
+    if not job_ids:
+        return []
+
+    jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_(job_ids)).all()}
+    return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
+
+@router.get("/by-slug/{slug}", response_model=JobDetailResponse)
+def get_job_detail_by_slug(
+    slug: str,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    job_id = job_slug_cache.get(slug)
+
+    if job_id is None:
+        job_id = db.query(Job.id).filter(Job.slug == slug).scalar()
+
+        if job_id is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        job_slug_cache.set(slug, job_id)
+
+    return render_job_detail(db, job_id, if_none_match)
+
+
 @router.get("/{job_id}", response_model=JobDetailResponse)
-def get_job_detail(job_id: str, db: Session = Depends(get_db)):
-    job = db.query(Job).filter(Job.id == job_id).first()
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    employer = db.query(Employer).filter(Employer.id == job.employer_id).first()
-    
-    return {
-        **job.__dict__,
-        "employer_name": employer.company_name
-    }
+def get_job_detail(
+    job_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    return render_job_detail(db, job_id, if_none_match)
+
+
+def render_job_detail(db: Session, job_id: str, if_none_match: Optional[str]) -> Response:
+    """Detail payload of one job, served from the listing cache and revalidated by ETag"""
+
+    key = ("detail", get_jobs_version(), job_id)
+    cached = job_listing_cache.get(key)
+
+    if cached is None:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
 
+        etag = make_etag(job.id, job.updated_at or job.created_at)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": DETAIL_CACHE_CONTROL})
 
-@router.get("/employer/my-jobs", response_model=List[JobResponse])
+        detail = JobDetailResponse.model_validate(job)
+        cached = (etag, detail.model_dump_json().encode())
+        job_listing_cache.set(key, cached)
+
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": DETAIL_CACHE_CONTROL}
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/employer/my-jobs", response_model=List[EmployerJobResponse])
 def get_my_jobs(
+    response: Response,
     status: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     employer: Employer = Depends(get_current_employer),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Job).filter(Job.employer_id == employer.id)
-    
-    if status:
-        query = query.filter(Job.status == status)
-    
-    query = query.order_by(Job.created_at.desc())
-    return query.offset(skip).limit(limit).all()
+    query = build_employer_jobs_query(db, employer.id, status)
+    return paginate(query, Job, skip, limit, cursor, response)
 
 
 @router.patch("/{job_id}", response_model=JobResponse)
@@ -146,6 +528,7 @@ def update_job(
         setattr(job, field, value)
     
     db.commit()
+    jobs_changed(db, [job_id])
     db.refresh(job)
     
     return job
@@ -167,6 +550,7 @@ def delete_job(
     
     job.status = "closed"
     db.commit()
+    jobs_changed(db, [job_id])
     
     return None
 
@@ -1,21 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, update
 from typing import List, Optional
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, time, timezone, timedelta
+from app.config import settings
 from app.database import get_db
 from app.api.deps import get_current_user, get_current_employer
-from app.schemas.work_tracking import WorkSessionCreate, WorkSessionStart, WorkSessionEnd, WorkSessionApproveStart, WorkSessionApproveEnd, WorkSessionResponse, WorkSessionSummary
+from app.schemas.work_tracking import WorkSessionCreate, WorkSessionStart, WorkSessionEnd, WorkSessionApproveStart, WorkSessionApproveEnd, WorkSessionResponse, WorkSessionSummary, WorkSessionBulkApprove, WorkSessionBulkApproveResponse
 from app.models.work_tracking import WorkSession
+from app.models.work_session_rollup import WorkSessionRollup
 from app.models.user import User
 from app.models.employer import Employer
 from app.models.job import Job
+from app.core.constants import WORK_SESSION_STATES
+from app.core.pagination import paginate
+from app.core.aggregates import count_where, sum_where
+from app.core.events import publish_work_session
+from app.core.dashboard import invalidate_employer_dashboard
+from app.core.payroll import PAYROLL_FORMATS, stream_payroll
 
 router = APIRouter(
     prefix="/work-sessions",
     tags=["Work Tracking"]
 )
 
+
+def build_work_session_query(db: Session):
+    """Work sessions with the names WorkSessionResponse shows, joined in rather than lazy-loaded per row"""
+
+    return db.query(
+        *WorkSession.__table__.columns,
+        (User.first_name + " " + User.last_name).label("user_name"),
+        Job.title.label("job_title"),
+        Job.employer_name.label("employer_name")
+    ).join(User, User.id == WorkSession.user_id).join(Job, Job.id == WorkSession.job_id)
+
+
+def load_work_session(db: Session, session_id: str):
+    return build_work_session_query(db).filter(WorkSession.id == session_id).one()
+
+
+def filter_by_state(query, status: Optional[str]):
+    if status in WORK_SESSION_STATES:
+        query = query.filter(WorkSession.state == status)
+
+    return query
+
+
 @router.post("", response_model=WorkSessionResponse, status_code=status.HTTP_201_CREATED)
 def create_work_session(
     session_data: WorkSessionCreate,
@@ -39,7 +71,7 @@ def create_work_session(
     existing_session = db.query(WorkSession).filter(
         WorkSession.user_id == user.id,
         WorkSession.job_id == session_data.job_id,
-        WorkSession.work_ended == False
+        WorkSession.state.in_(("pending_start", "start_approved", "active"))
     ).first()
     
     if existing_session:
@@ -53,18 +85,114 @@ def create_work_session(
         start_approved=False,
         end_approved=False,
         work_started=False,
-        work_ended=False
+        work_ended=False,
+        state="pending_start"
     )
     
     db.add(new_session)
+    db.flush()
+    session_id = new_session.id
     db.commit()
-    db.refresh(new_session)
-    
-    new_session.user_name = f"{user.first_name} {user.last_name}"
-    new_session.job_title = job.title
-    new_session.employer_name = job.employer.company_name
+    invalidate_employer_dashboard(job.employer_id)
     
-    return new_session
+    return load_work_session(db, session_id)
+
+def bulk_approve_work_sessions(db: Session, employer: Employer, approve_data: WorkSessionBulkApprove, phase: str) -> dict:
+    """Approve (or decline) the start or end of many sessions: one ownership read and one UPDATE
+
+    Results come back per session in the order given; sessions that are not the
+    employer's or not at the right step are reported rather than failing the lot.
+    """
+
+    session_ids = approve_data.session_ids
+    if not session_ids:
+        raise HTTPException(status_code=400, detail="No work sessions given")
+
+    if len(session_ids) > settings.WORK_SESSION_BULK_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.WORK_SESSION_BULK_MAX_ROWS} work sessions can be approved at once")
+
+    if len(set(session_ids)) != len(session_ids):
+        raise HTTPException(status_code=400, detail="Each work session can only be listed once")
+
+    now = datetime.now(timezone.utc)
+    if phase == "start":
+        allowed = ("pending_start", "start_approved")
+        wrong_step = "Work already started"
+        values = {
+            "start_approved": approve_data.approved,
+            "state": "start_approved" if approve_data.approved else "pending_start",
+            "employer_start_notes": approve_data.employer_notes,
+            "updated_at": now
+        }
+    else:
+        allowed = ("pending_end", "completed")
+        wrong_step = "Work session not ended yet"
+        values = {
+            "end_approved": approve_data.approved,
+            "state": "completed" if approve_data.approved else "pending_end",
+            "employer_end_notes": approve_data.employer_notes,
+            "updated_at": now
+        }
+
+    owned = {
+        row.id
+        for row in db.query(WorkSession.id).filter(
+            WorkSession.id.in_(session_ids),
+            WorkSession.employer_id == employer.id
+        )
+    }
+
+    # The state guard is repeated in the UPDATE so a worker acting in between is reported, not overwritten
+    changed = db.execute(
+        update(WorkSession)
+        .where(WorkSession.id.in_(owned), WorkSession.state.in_(allowed))
+        .values(**values)
+        .returning(
+            WorkSession.id, WorkSession.user_id, WorkSession.job_id, WorkSession.employer_id,
+            WorkSession.start_approved, WorkSession.work_started, WorkSession.work_ended,
+            WorkSession.end_approved, WorkSession.state, WorkSession.updated_at
+        ),
+        execution_options={"synchronize_session": False}
+    ).all() if owned else []
+
+    db.commit()
+
+    changed_by_id = {row.id: row for row in changed}
+    if changed:
+        invalidate_employer_dashboard(employer.id)
+    for row in changed:
+        publish_work_session(row)
+
+    results = []
+    for session_id in session_ids:
+        if session_id in changed_by_id:
+            results.append({"session_id": session_id, "state": changed_by_id[session_id].state})
+        elif session_id in owned:
+            results.append({"session_id": session_id, "error": wrong_step})
+        else:
+            results.append({"session_id": session_id, "error": "Work session not found"})
+
+    return {"updated": len(changed), "results": results}
+
+@router.post("/bulk/approve-start", response_model=WorkSessionBulkApproveResponse)
+def bulk_approve_start_work_sessions(
+    approve_data: WorkSessionBulkApprove,
+    employer: Employer = Depends(get_current_employer),
+    db: Session = Depends(get_db)
+):
+    """Approve the start of many sessions at once, e.g. the morning roll-call of a site"""
+
+    return bulk_approve_work_sessions(db, employer, approve_data, "start")
+
+@router.post("/bulk/approve-end", response_model=WorkSessionBulkApproveResponse)
+def bulk_approve_end_work_sessions(
+    approve_data: WorkSessionBulkApprove,
+    employer: Employer = Depends(get_current_employer),
+    db: Session = Depends(get_db)
+):
+    """Approve the end of many sessions at once"""
+
+    return bulk_approve_work_sessions(db, employer, approve_data, "end")
 
 @router.post("/{session_id}/request-start", response_model=WorkSessionResponse)
 def request_start_work_session(
@@ -93,18 +221,18 @@ def request_start_work_session(
         )
     
     session.work_started = True
+    session.state = "active"
     session.start_time = datetime.now(timezone.utc)
     session.notes = start_data.notes
     session.updated_at = datetime.now(timezone.utc)
     
     db.commit()
-    db.refresh(session)
-    
-    session.user_name = f"{user.first_name} {user.last_name}"
-    session.job_title = session.job.title
-    session.employer_name = session.employer.company_name
+
+    row = load_work_session(db, session_id)
+    invalidate_employer_dashboard(row.employer_id)
+    publish_work_session(row)
     
-    return session
+    return row
 
 @router.post("/{session_id}/request-end", response_model=WorkSessionResponse)
 def request_end_work_session(
@@ -127,6 +255,7 @@ def request_end_work_session(
         raise HTTPException(status_code=400, detail="Work already ended")
     
     session.work_ended = True
+    session.state = "pending_end"
     session.end_time = datetime.now(timezone.utc)
     
     if session.start_time and session.end_time:
@@ -143,13 +272,12 @@ def request_end_work_session(
     session.updated_at = datetime.now(timezone.utc)
     
     db.commit()
-    db.refresh(session)
-    
-    session.user_name = f"{user.first_name} {user.last_name}"
-    session.job_title = session.job.title
-    session.employer_name = session.employer.company_name
+
+    row = load_work_session(db, session_id)
+    invalidate_employer_dashboard(row.employer_id)
+    publish_work_session(row)
     
-    return session
+    return row
 
 @router.post("/{session_id}/approve-start", response_model=WorkSessionResponse)
 def approve_start_work_session(
@@ -169,17 +297,17 @@ def approve_start_work_session(
         raise HTTPException(status_code=400, detail="Work already started")
     
     session.start_approved = approve_data.approved
+    session.state = "start_approved" if approve_data.approved else "pending_start"
     session.employer_start_notes = approve_data.employer_notes
     session.updated_at = datetime.now(timezone.utc)
     
     db.commit()
-    db.refresh(session)
-    
-    session.user_name = f"{session.user.first_name} {session.user.last_name}"
-    session.job_title = session.job.title
-    session.employer_name = employer.company_name
+
+    row = load_work_session(db, session_id)
+    invalidate_employer_dashboard(row.employer_id)
+    publish_work_session(row)
     
-    return session
+    return row
 
 @router.post("/{session_id}/approve-end", response_model=WorkSessionResponse)
 def approve_end_work_session(
@@ -199,160 +327,108 @@ def approve_end_work_session(
         raise HTTPException(status_code=400, detail="Work session not ended yet")
     
     session.end_approved = approve_data.approved
+    session.state = "completed" if approve_data.approved else "pending_end"
     session.employer_end_notes = approve_data.employer_notes
     session.updated_at = datetime.now(timezone.utc)
     
     db.commit()
-    db.refresh(session)
-    
-    session.user_name = f"{session.user.first_name} {session.user.last_name}"
-    session.job_title = session.job.title
-    session.employer_name = employer.company_name
+
+    row = load_work_session(db, session_id)
+    invalidate_employer_dashboard(row.employer_id)
+    publish_work_session(row)
     
-    return session
+    return row
 
 @router.get("/my-sessions", response_model=List[WorkSessionResponse])
 def get_my_work_sessions(
-    status: Optional[str] = Query(None, description="Filter by status: pending_start, pending_end, active, completed"),
+    response: Response,
+    status: Optional[str] = Query(None, description="Filter by state: pending_start, start_approved, active, pending_end, completed"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    query = db.query(WorkSession).filter(WorkSession.user_id == user.id)
-    
-    if status == "pending_start":
-        query = query.filter(WorkSession.start_approved == False, WorkSession.work_started == False)
-    elif status == "pending_end":
-        query = query.filter(WorkSession.work_ended == True, WorkSession.end_approved == False)
-    elif status == "active":
-        query = query.filter(WorkSession.work_started == True, WorkSession.work_ended == False)
-    elif status == "completed":
-        query = query.filter(WorkSession.end_approved == True)
-    
-    sessions = query.order_by(desc(WorkSession.created_at)).offset(skip).limit(limit).all()
-    
-    for session in sessions:
-        session.user_name = f"{user.first_name} {user.last_name}"
-        session.job_title = session.job.title
-        session.employer_name = session.employer.company_name
-    
-    return sessions
+    query = filter_by_state(build_work_session_query(db).filter(WorkSession.user_id == user.id), status)
+    return paginate(query, WorkSession, skip, limit, cursor, response)
 
 @router.get("/employer/sessions", response_model=List[WorkSessionResponse])
 def get_employer_work_sessions(
-    status: Optional[str] = Query(None, description="Filter by status: pending_start, pending_end, active, completed"),
+    response: Response,
+    status: Optional[str] = Query(None, description="Filter by state: pending_start, start_approved, active, pending_end, completed"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     employer: Employer = Depends(get_current_employer),
     db: Session = Depends(get_db)
 ):
-    query = db.query(WorkSession).filter(WorkSession.employer_id == employer.id)
-    
-    if status == "pending_start":
-        query = query.filter(WorkSession.start_approved == False, WorkSession.work_started == False)
-    elif status == "pending_end":
-        query = query.filter(WorkSession.work_ended == True, WorkSession.end_approved == False)
-    elif status == "active":
-        query = query.filter(WorkSession.work_started == True, WorkSession.work_ended == False)
-    elif status == "completed":
-        query = query.filter(WorkSession.end_approved == True)
-    
-    sessions = query.order_by(desc(WorkSession.created_at)).offset(skip).limit(limit).all()
-    
-    for session in sessions:
-        session.user_name = f"{session.user.first_name} {session.user.last_name}"
-        session.job_title = session.job.title
-        session.employer_name = employer.company_name
-    
-    return sessions
+    query = filter_by_state(build_work_session_query(db).filter(WorkSession.employer_id == employer.id), status)
+    return paginate(query, WorkSession, skip, limit, cursor, response)
+
+@router.get("/employer/payroll")
+def export_employer_payroll(
+    date_from: Optional[date] = Query(None, description="First day (UTC) of sessions to include"),
+    date_to: Optional[date] = Query(None, description="Last day (UTC) of sessions to include"),
+    format: str = Query("csv", description="csv or ndjson"),
+    employer: Employer = Depends(get_current_employer)
+):
+    """Stream every session created in the date range, then subtotals per worker, per job and overall
+
+    Each line has a record field: session, worker, job or total.
+    """
+
+    if format not in PAYROLL_FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be csv or ndjson")
+
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+
+    start = datetime.combine(date_from, time.min) if date_from else None
+    end = datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+
+    return StreamingResponse(
+        stream_payroll(employer.id, start, end, format),
+        media_type=PAYROLL_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="payroll.{format}"'}
+    )
 
 @router.get("/summary", response_model=WorkSessionSummary)
 def get_work_session_summary(
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    total_sessions = db.query(WorkSession).filter(WorkSession.user_id == user.id).count()
-    
-    approved_sessions = db.query(WorkSession).filter(
-        WorkSession.user_id == user.id,
-        WorkSession.end_approved == True
-    ).count()
-    
-    pending_start_approval = db.query(WorkSession).filter(
-        WorkSession.user_id == user.id,
-        WorkSession.start_approved == False,
-        WorkSession.work_started == False
-    ).count()
-    
-    pending_end_approval = db.query(WorkSession).filter(
-        WorkSession.user_id == user.id,
-        WorkSession.work_ended == True,
-        WorkSession.end_approved == False
-    ).count()
-    
-    total_earnings_result = db.query(func.sum(WorkSession.daily_payment)).filter(
-        WorkSession.user_id == user.id,
-        WorkSession.end_approved == True
-    ).scalar()
-    total_earnings = total_earnings_result or 0
-    
-    total_hours_result = db.query(func.sum(WorkSession.hours_worked)).filter(
-        WorkSession.user_id == user.id,
-        WorkSession.end_approved == True
-    ).scalar()
-    total_hours = total_hours_result or 0
-    
-    return WorkSessionSummary(
-        total_sessions=total_sessions,
-        approved_sessions=approved_sessions,
-        total_earnings=total_earnings,
-        pending_start_approval=pending_start_approval,
-        pending_end_approval=pending_end_approval,
-        total_hours=total_hours
-    )
+    return summarize_work_sessions(db, "user", user.id)
 
 @router.get("/employer/summary", response_model=WorkSessionSummary)
 def get_employer_work_session_summary(
     employer: Employer = Depends(get_current_employer),
     db: Session = Depends(get_db)
 ):
-    total_sessions = db.query(WorkSession).filter(WorkSession.employer_id == employer.id).count()
-    
-    approved_sessions = db.query(WorkSession).filter(
-        WorkSession.employer_id == employer.id,
-        WorkSession.end_approved == True
-    ).count()
-    
-    pending_start_approval = db.query(WorkSession).filter(
-        WorkSession.employer_id == employer.id,
-        WorkSession.start_approved == False,
-        WorkSession.work_started == False
-    ).count()
-    
-    pending_end_approval = db.query(WorkSession).filter(
-        WorkSession.employer_id == employer.id,
-        WorkSession.work_ended == True,
-        WorkSession.end_approved == False
-    ).count()
-    
-    total_earnings_result = db.query(func.sum(WorkSession.daily_payment)).filter(
-        WorkSession.employer_id == employer.id,
-        WorkSession.end_approved == True
-    ).scalar()
-    total_earnings = total_earnings_result or 0
-    
-    total_hours_result = db.query(func.sum(WorkSession.hours_worked)).filter(
-        WorkSession.employer_id == employer.id,
-        WorkSession.end_approved == True
-    ).scalar()
-    total_hours = total_hours_result or 0
-    
-    return WorkSessionSummary(
-        total_sessions=total_sessions,
-        approved_sessions=approved_sessions,
-        total_earnings=total_earnings,
-        pending_start_approval=pending_start_approval,
-        pending_end_approval=pending_end_approval,
-        total_hours=total_hours
-    )
\ No newline at end of file
+    return summarize_work_sessions(db, "employer", employer.id)
+
+
+def summarize_work_sessions(db: Session, principal_type: str, principal_id: str) -> WorkSessionSummary:
+    """Summary of a worker's or employer's sessions: a primary-key read with rollups on, else one aggregate query"""
+
+    if settings.WORK_SESSION_ROLLUPS:
+        rollup = db.get(WorkSessionRollup, (principal_type, principal_id))
+        if rollup is None:
+            return WorkSessionSummary(
+                total_sessions=0, approved_sessions=0, total_earnings=0,
+                pending_start_approval=0, pending_end_approval=0, total_hours=0
+            )
+        return WorkSessionSummary.model_validate(rollup, from_attributes=True)
+
+    owner = WorkSession.user_id if principal_type == "user" else WorkSession.employer_id
+    approved = WorkSession.state == "completed"
+
+    summary = db.query(
+        func.count(WorkSession.id).label("total_sessions"),
+        count_where(approved).label("approved_sessions"),
+        sum_where(approved, WorkSession.daily_payment).label("total_earnings"),
+        count_where(WorkSession.state == "pending_start").label("pending_start_approval"),
+        count_where(WorkSession.state == "pending_end").label("pending_end_approval"),
+        sum_where(approved, WorkSession.hours_worked).label("total_hours")
+    ).filter(owner == principal_id).one()
+
+    return WorkSessionSummary(**summary._asdict())
@@ -16,6 +16,38 @@ class Settings(BaseSettings):
     # Cors
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
 
+    # Public job listing cache
+    JOB_CACHE_MAX_ENTRIES: int = 1024
+    JOB_CACHE_TTL_SECONDS: int = 30
+    # Slugs never change once generated, so slug -> id entries never expire
+    JOB_SLUG_CACHE_MAX_ENTRIES: int = 10000
+
+    # Employer dashboard cache; entries are also dropped on every write touching the employer
+    EMPLOYER_DASHBOARD_CACHE_MAX_ENTRIES: int = 1024
+    EMPLOYER_DASHBOARD_CACHE_TTL_SECONDS: int = 300
+
+    # Bulk job posting
+    JOB_BULK_MAX_ROWS: int = 500
+
+    # Bulk application status changes
+    APPLICATION_BULK_MAX_ROWS: int = 500
+
+    # Bulk work session approvals
+    WORK_SESSION_BULK_MAX_ROWS: int = 500
+
+    # Closing jobs past their application deadline (0 disables the background sweep)
+    JOB_EXPIRY_SWEEP_SECONDS: int = 300
+    JOB_EXPIRY_BATCH_SIZE: int = 500
+
+    # Serve work session summaries from a trigger-maintained rollup table instead of aggregating
+    WORK_SESSION_ROLLUPS: bool = False
+
+    # Server-sent event streams
+    EVENT_QUEUE_SIZE: int = 100
+    EVENT_HEARTBEAT_SECONDS: int = 15
+    # Lifetime of the ticket that opens a stream; it travels in the URL, so keep it short
+    STREAM_TICKET_EXPIRE_SECONDS: int = 60
+
     class Config:
         env_file = ".env"
 
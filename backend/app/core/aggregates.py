@@ -0,0 +1,11 @@
+from sqlalchemy import case, func
+
+
+def count_where(condition):
+    """Number of rows matching condition, for single-pass conditional aggregation"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def sum_where(condition, column):
+    """Sum of column over the rows matching condition"""
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
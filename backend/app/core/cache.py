@@ -0,0 +1,102 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from app.config import settings
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ttl seconds
+
+    on_evict(key, value), if given, is called (under the cache lock) whenever an
+    entry leaves the cache: expired, evicted, replaced, popped or cleared.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float], on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evicted(self, key: Hashable, entry):
+        if self.on_evict is not None:
+            self.on_evict(key, entry[1])
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or (entry[0] is not None and entry[0] < time.monotonic()):
+                if entry is not None:
+                    del self._entries[key]
+                    self._evicted(key, entry)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self._evicted(key, previous)
+
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._evicted(*self._entries.popitem(last=False))
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._evicted(key, entry)
+
+    def clear(self):
+        with self._lock:
+            for key, entry in self._entries.items():
+                self._evicted(key, entry)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# Bumped after every committed job write. Listing cache keys and ETags embed the
+# version, so entries from before a write are never served again and simply age out.
+# It starts from the boot time so versions are not reused across restarts.
+_jobs_version = time.time_ns()
+_jobs_version_lock = threading.Lock()
+
+
+def get_jobs_version() -> int:
+    return _jobs_version
+
+
+def bump_jobs_version() -> int:
+    global _jobs_version
+    with _jobs_version_lock:
+        _jobs_version += 1
+        return _jobs_version
+
+
+# Rendered responses of the anonymous job read routes
+job_listing_cache = TTLCache(settings.JOB_CACHE_MAX_ENTRIES, settings.JOB_CACHE_TTL_SECONDS)
+
+# Job id behind each recently requested slug
+job_slug_cache = TTLCache(settings.JOB_SLUG_CACHE_MAX_ENTRIES, None)
@@ -29,4 +29,142 @@ JOB_CATEGORIES = [
     "Shop Attendant",
     "Waiter & Waitress",
     "Other Services"
-]
\ No newline at end of file
+]
+
+# Lifecycle of a work session, in order. "start_approved" is approved but not yet started.
+WORK_SESSION_STATES = ["pending_start", "start_approved", "active", "pending_end", "completed"]
+
+# Search terms for each category in English, Kinyarwanda, French and Swahili
+CATEGORY_SYNONYMS = {
+    "Cleaning & Housekeeping": [
+        "cleaner", "cleaning", "housekeeper", "maid", "house help",
+        "isuku", "umukozi wo mu rugo", "nettoyage", "menage", "femme de menage",
+        "usafi", "msafishaji", "mfanyakazi wa nyumbani"
+    ],
+    "Construction & Carpentry": [
+        "builder", "construction", "mason", "carpenter",
+        "umwubatsi", "ubwubatsi", "umubaji", "macon", "charpentier", "menuisier",
+        "mjenzi", "ujenzi", "seremala", "fundi"
+    ],
+    "Plumbing & Electrical": [
+        "plumber", "plumbing", "electrician", "wiring", "pipes",
+        "amashanyarazi", "amazi", "plombier", "electricien",
+        "fundi bomba", "fundi umeme", "umeme", "bomba"
+    ],
+    "Gardening & Landscaping": [
+        "gardener", "gardening", "landscaping",
+        "ubusitani", "umurimyi", "jardinier", "jardinage",
+        "bustani", "mtunza bustani"
+    ],
+    "Security & Watchman": [
+        "security", "guard", "watchman",
+        "umuzamu", "abazamu", "umurinzi", "gardien", "securite", "veilleur",
+        "mlinzi", "askari", "ulinzi"
+    ],
+    "Cooking & Catering": [
+        "cook", "chef", "catering",
+        "umutetsi", "guteka", "cuisinier", "cuisine", "traiteur",
+        "mpishi", "upishi"
+    ],
+    "Childcare & Nanny": [
+        "nanny", "babysitter", "childcare",
+        "umurezi", "kurera abana", "nounou", "garde d enfants",
+        "yaya", "mlezi"
+    ],
+    "Delivery & Transport": [
+        "driver", "delivery", "transport", "moto",
+        "umushoferi", "umumotari", "chauffeur", "livreur", "livraison",
+        "dereva", "usafirishaji"
+    ],
+    "Tailoring & Sewing": [
+        "tailor", "sewing",
+        "umudozi", "kudoda", "couturier", "couture", "tailleur",
+        "mshonaji", "kushona", "fundi cherehani"
+    ],
+    "Painting & Decoration": [
+        "painter", "painting", "decoration",
+        "irangi", "gusiga irangi", "peintre", "peinture", "decorateur",
+        "rangi", "mpaka rangi"
+    ],
+    "Welding & Metal Work": [
+        "welder", "welding", "metal",
+        "umusudira", "gusudira", "soudeur", "soudure",
+        "fundi chuma", "kuchomelea"
+    ],
+    "Mechanics & Repair": [
+        "mechanic", "repair", "garage",
+        "umukanishi", "gukanika", "mecanicien", "reparation",
+        "makanika", "fundi magari", "matengenezo"
+    ],
+    "Hair & Beauty Services": [
+        "hairdresser", "barber", "salon", "beauty",
+        "umwogoshi", "umudefiriza", "coiffeur", "coiffeuse", "estheticienne",
+        "kinyozi", "msusi", "urembo"
+    ],
+    "Laundry Services": [
+        "laundry", "washing clothes",
+        "kumesa", "umumesi", "blanchisserie", "lessive",
+        "kufua", "dobi"
+    ],
+    "General Labor": [
+        "labourer", "laborer", "helper", "casual",
+        "ikiraka", "umukozi", "manoeuvre", "ouvrier",
+        "kibarua", "mfanyakazi"
+    ],
+    "Farm Work & Agriculture": [
+        "farmer", "farm", "agriculture", "harvest",
+        "umuhinzi", "ubuhinzi", "agriculteur", "ferme", "recolte",
+        "mkulima", "kilimo", "shamba"
+    ],
+    "Shop Attendant": [
+        "shop attendant", "cashier", "sales",
+        "umucuruzi", "iduka", "vendeur", "vendeuse", "caissier", "boutique",
+        "muuzaji", "duka"
+    ],
+    "Waiter & Waitress": [
+        "waiter", "waitress",
+        "umuseriveri", "serveur", "serveuse",
+        "mhudumu"
+    ],
+}
+
+# Approximate district centroids (latitude, longitude)
+DISTRICT_CENTROIDS = {
+    "Bugesera": (-2.21, 30.15), "Burera": (-1.47, 29.83), "Gakenke": (-1.70, 29.78),
+    "Gasabo": (-1.88, 30.13), "Gatsibo": (-1.58, 30.45), "Gicumbi": (-1.60, 30.07),
+    "Gisagara": (-2.61, 29.84), "Huye": (-2.59, 29.74), "Kamonyi": (-2.01, 29.90),
+    "Karongi": (-2.07, 29.40), "Kayonza": (-1.90, 30.51), "Kicukiro": (-1.99, 30.10),
+    "Kirehe": (-2.27, 30.70), "Muhanga": (-2.08, 29.75), "Musanze": (-1.50, 29.63),
+    "Ngoma": (-2.17, 30.53), "Ngororero": (-1.87, 29.62), "Nyabihu": (-1.65, 29.51),
+    "Nyagatare": (-1.30, 30.33), "Nyamagabe": (-2.47, 29.48), "Nyamasheke": (-2.34, 29.13),
+    "Nyanza": (-2.35, 29.75), "Nyarugenge": (-1.96, 30.05), "Nyaruguru": (-2.69, 29.55),
+    "Rubavu": (-1.69, 29.36), "Ruhango": (-2.23, 29.78), "Rulindo": (-1.73, 29.99),
+    "Rusizi": (-2.48, 28.91), "Rutsiro": (-1.94, 29.33), "Rwamagana": (-1.95, 30.43)
+}
+
+# Districts sharing a border (each pair listed at least once)
+DISTRICT_NEIGHBOURS = {
+    "Bugesera": ["Kicukiro", "Nyarugenge", "Kamonyi", "Ruhango", "Nyanza", "Gisagara", "Ngoma", "Rwamagana"],
+    "Burera": ["Musanze", "Gakenke", "Rulindo", "Gicumbi"],
+    "Gakenke": ["Musanze", "Nyabihu", "Ngororero", "Muhanga", "Kamonyi", "Rulindo"],
+    "Gasabo": ["Nyarugenge", "Kicukiro", "Rulindo", "Gicumbi", "Gatsibo", "Rwamagana"],
+    "Gatsibo": ["Nyagatare", "Gicumbi", "Kayonza", "Rwamagana"],
+    "Gicumbi": ["Nyagatare", "Rulindo"],
+    "Gisagara": ["Huye", "Nyanza"],
+    "Huye": ["Nyanza", "Nyamagabe", "Nyaruguru"],
+    "Kamonyi": ["Nyarugenge", "Rulindo", "Muhanga", "Ruhango"],
+    "Karongi": ["Rutsiro", "Ngororero", "Muhanga", "Ruhango", "Nyamagabe", "Nyamasheke"],
+    "Kayonza": ["Nyagatare", "Rwamagana", "Ngoma", "Kirehe"],
+    "Kicukiro": ["Nyarugenge", "Rwamagana"],
+    "Kirehe": ["Ngoma"],
+    "Muhanga": ["Ngororero", "Ruhango"],
+    "Musanze": ["Nyabihu"],
+    "Ngoma": ["Rwamagana"],
+    "Ngororero": ["Nyabihu", "Rutsiro"],
+    "Nyabihu": ["Rubavu", "Rutsiro"],
+    "Nyamagabe": ["Nyanza", "Ruhango", "Nyaruguru", "Nyamasheke", "Rusizi"],
+    "Nyamasheke": ["Rusizi"],
+    "Nyanza": ["Ruhango"],
+    "Nyarugenge": ["Rulindo"],
+    "Rubavu": ["Rutsiro"]
+}
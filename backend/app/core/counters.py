@@ -0,0 +1,62 @@
+from sqlalchemy.engine import Engine
+from app.core.triggers import install_triggers
+
+# Per-status application counts on jobs. "x IS 'status'" is 0 or 1 (never NULL),
+# so each statement moves exactly one counter by one.
+_ADD = """
+    UPDATE jobs SET
+        pending_applications = pending_applications + (new.status IS 'pending'),
+        reviewing_applications = reviewing_applications + (new.status IS 'reviewing'),
+        accepted_applications = accepted_applications + (new.status IS 'accepted'),
+        rejected_applications = rejected_applications + (new.status IS 'rejected')
+    WHERE id = new.job_id;
+"""
+
+_REMOVE = """
+    UPDATE jobs SET
+        pending_applications = pending_applications - (old.status IS 'pending'),
+        reviewing_applications = reviewing_applications - (old.status IS 'reviewing'),
+        accepted_applications = accepted_applications - (old.status IS 'accepted'),
+        rejected_applications = rejected_applications - (old.status IS 'rejected')
+    WHERE id = old.job_id;
+"""
+
+_COUNTER_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS application_counts_ai AFTER INSERT ON applications
+    BEGIN
+        {_ADD}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS application_counts_ad AFTER DELETE ON applications
+    BEGIN
+        {_REMOVE}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS application_counts_au AFTER UPDATE OF status, job_id ON applications
+    WHEN old.status IS NOT new.status OR old.job_id IS NOT new.job_id
+    BEGIN
+        {_REMOVE}
+        {_ADD}
+    END
+    """,
+]
+
+
+_COUNTER_SEED = [
+    """
+    UPDATE jobs SET
+        pending_applications = (SELECT COUNT(*) FROM applications a WHERE a.job_id = jobs.id AND a.status = 'pending'),
+        reviewing_applications = (SELECT COUNT(*) FROM applications a WHERE a.job_id = jobs.id AND a.status = 'reviewing'),
+        accepted_applications = (SELECT COUNT(*) FROM applications a WHERE a.job_id = jobs.id AND a.status = 'accepted'),
+        rejected_applications = (SELECT COUNT(*) FROM applications a WHERE a.job_id = jobs.id AND a.status = 'rejected')
+    """,
+]
+
+
+def init_application_counters(engine: Engine):
+    """Install the application counter triggers, recounting the first time"""
+
+    install_triggers(engine, "application_counts_ai", _COUNTER_TRIGGERS, _COUNTER_SEED)
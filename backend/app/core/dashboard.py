@@ -0,0 +1,74 @@
+import threading
+from typing import Dict, Iterable, Tuple
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.job_events import on_jobs_changed
+
+# job_id -> employer_id for every job on a cached dashboard, so a write that
+# only knows the job (applying, withdrawing) can find the dashboard to drop
+_job_employers: Dict[str, str] = {}
+
+# Bumped by every invalidation, so a dashboard built from data that a write has
+# since changed is not cached. Job-only writes whose employer is unknown (no
+# dashboard cached yet) bump the shared counter instead.
+_generations: Dict[str, int] = {}
+_unmapped_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _forget_jobs(employer_id: str, dashboard):
+    for job in dashboard.jobs:
+        if _job_employers.get(job.id) == employer_id:
+            del _job_employers[job.id]
+
+
+# Rendered /employers/me/dashboard per employer
+employer_dashboard_cache = TTLCache(
+    settings.EMPLOYER_DASHBOARD_CACHE_MAX_ENTRIES,
+    settings.EMPLOYER_DASHBOARD_CACHE_TTL_SECONDS,
+    on_evict=_forget_jobs
+)
+
+
+def dashboard_generation(employer_id: str) -> Tuple[int, int]:
+    """Read before building a dashboard and hand to cache_dashboard"""
+    return _unmapped_generation, _generations.get(employer_id, 0)
+
+
+def cache_dashboard(employer_id: str, dashboard, generation: Tuple[int, int]):
+    """Cache the dashboard unless a write invalidated it after generation was read"""
+
+    with _generation_lock:
+        if dashboard_generation(employer_id) != generation:
+            return
+        employer_dashboard_cache.set(employer_id, dashboard)
+        for job in dashboard.jobs:
+            _job_employers[job.id] = employer_id
+
+
+def invalidate_employer_dashboard(employer_id: str):
+    with _generation_lock:
+        _generations[employer_id] = _generations.get(employer_id, 0) + 1
+        employer_dashboard_cache.pop(employer_id)
+
+
+def invalidate_job_dashboards(job_ids: Iterable[str]):
+    """Drop the cached dashboards showing any of these jobs"""
+
+    global _unmapped_generation
+    for job_id in job_ids:
+        employer_id = _job_employers.get(job_id)
+        if employer_id is not None:
+            invalidate_employer_dashboard(employer_id)
+        else:
+            with _generation_lock:
+                _unmapped_generation += 1
+
+
+@on_jobs_changed
+def _jobs_changed(changes):
+    for job_id, row in changes:
+        if row is not None:
+            invalidate_employer_dashboard(row.employer_id)
+        else:
+            invalidate_job_dashboards([job_id])
@@ -0,0 +1,100 @@
+import json
+import asyncio
+import threading
+from typing import Dict, Set, Tuple
+from fastapi.encoders import jsonable_encoder
+from app.config import settings
+
+# Sent instead of the dropped events when a subscriber falls behind; the client
+# should refetch the lists it is showing
+RESYNC_EVENT = "resync"
+
+
+class Subscriber:
+    """One open event stream, fed from any thread through its event loop"""
+
+    def __init__(self, principal: Tuple[str, str]):
+        self.principal = principal
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EVENT_QUEUE_SIZE)
+
+    def offer(self, message: str):
+        # Runs on the subscriber's loop. Publishers never wait on a slow reader:
+        # when the queue is full the backlog is dropped and replaced by a resync.
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_event(RESYNC_EVENT, {}))
+
+
+class EventHub:
+    """In-process pub/sub keyed by principal, e.g. ("user", user_id) or ("employer", employer_id)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Tuple[str, str], Set[Subscriber]] = {}
+
+    def subscribe(self, principal_type: str, principal_id: str) -> Subscriber:
+        subscriber = Subscriber((principal_type, principal_id))
+        with self._lock:
+            self._subscribers.setdefault(subscriber.principal, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.principal)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.principal]
+
+    def publish(self, principal_type: str, principal_id: str, event: str, data: dict):
+        """Queue an event for every open stream of the principal; safe to call from route threads"""
+
+        with self._lock:
+            subscribers = list(self._subscribers.get((principal_type, principal_id), ()))
+
+        if not subscribers:
+            return
+
+        message = format_event(event, data)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, message)
+            except RuntimeError:
+                # The stream's loop has shut down
+                self.unsubscribe(subscriber)
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+event_hub = EventHub()
+
+
+def publish_application_status(user_id: str, application_id: str, job_id: str, status: str):
+    event_hub.publish("user", user_id, "application.status", {
+        "application_id": application_id,
+        "job_id": job_id,
+        "status": status
+    })
+
+
+def publish_work_session(session):
+    """Tell both the worker and the employer about a work session state change"""
+
+    data = {
+        "session_id": session.id,
+        "job_id": session.job_id,
+        "start_approved": session.start_approved,
+        "work_started": session.work_started,
+        "work_ended": session.work_ended,
+        "end_approved": session.end_approved,
+        "state": session.state,
+        "updated_at": session.updated_at
+    }
+    event_hub.publish("user", session.user_id, "work_session.updated", data)
+    event_hub.publish("employer", session.employer_id, "work_session.updated", data)
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import SessionLocal
+from app.models.job import Job
+from app.core.job_events import jobs_changed
+
+logger = logging.getLogger(__name__)
+
+
+def close_expired_jobs(db: Session, batch_size: int) -> int:
+    """Close active jobs whose application deadline has passed, one bounded UPDATE per batch"""
+
+    now = datetime.now(timezone.utc)
+    closed = 0
+
+    while True:
+        batch = select(Job.id).where(
+            Job.status == "active",
+            Job.application_deadline < now
+        ).limit(batch_size).scalar_subquery()
+
+        job_ids = db.execute(
+            update(Job).where(Job.id.in_(batch)).values(status="closed", updated_at=now).returning(Job.id),
+            execution_options={"synchronize_session": False}
+        ).scalars().all()
+        # Commit per batch so the write lock is never held for long
+        db.commit()
+
+        if job_ids:
+            jobs_changed(db, job_ids)
+
+        closed += len(job_ids)
+        if len(job_ids) < batch_size:
+            break
+
+    return closed
+
+
+def sweep_expired_jobs() -> int:
+    db = SessionLocal()
+    try:
+        closed = close_expired_jobs(db, settings.JOB_EXPIRY_BATCH_SIZE)
+    finally:
+        db.close()
+
+    logger.info("Deadline sweep closed %d expired jobs", closed)
+    return closed
+
+
+async def run_expiry_sweeper():
+    """Background loop started with the app; runs the sweep every JOB_EXPIRY_SWEEP_SECONDS"""
+
+    while True:
+        try:
+            await run_in_threadpool(sweep_expired_jobs)
+        except Exception:
+            logger.exception("Deadline sweep failed")
+
+        await asyncio.sleep(settings.JOB_EXPIRY_SWEEP_SECONDS)
@@ -0,0 +1,45 @@
+from sqlalchemy.engine import Engine
+from app.core.triggers import install_triggers
+
+# Every write to jobs adjusts job_facet_counts
+_FACET_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS job_facets_ai AFTER INSERT ON jobs
+    BEGIN
+        INSERT INTO job_facet_counts(status, category, district, count)
+        VALUES (new.status, new.category, new.district, 1)
+        ON CONFLICT(status, category, district) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_facets_ad AFTER DELETE ON jobs
+    BEGIN
+        UPDATE job_facet_counts SET count = count - 1
+        WHERE status = old.status AND category = old.category AND district = old.district;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_facets_au AFTER UPDATE OF status, category, district ON jobs
+    WHEN old.status IS NOT new.status OR old.category IS NOT new.category OR old.district IS NOT new.district
+    BEGIN
+        UPDATE job_facet_counts SET count = count - 1
+        WHERE status = old.status AND category = old.category AND district = old.district;
+        INSERT INTO job_facet_counts(status, category, district, count)
+        VALUES (new.status, new.category, new.district, 1)
+        ON CONFLICT(status, category, district) DO UPDATE SET count = count + 1;
+    END
+    """,
+]
+
+
+_FACET_SEED = [
+    "DELETE FROM job_facet_counts",
+    "INSERT INTO job_facet_counts(status, category, district, count) "
+    "SELECT status, category, district, COUNT(*) FROM jobs GROUP BY status, category, district",
+]
+
+
+def init_job_facets(engine: Engine):
+    """Install the facet count triggers, seeding the counts the first time"""
+
+    install_triggers(engine, "job_facets_ai", _FACET_TRIGGERS, _FACET_SEED)
@@ -0,0 +1,87 @@
+import re
+import unicodedata
+from typing import Dict, FrozenSet, List
+from app.core.constants import JOB_CATEGORIES, CATEGORY_SYNONYMS
+
+# Below this a title or synonym is not considered a match for the query
+FUZZY_MIN_SIMILARITY = 0.3
+
+# A category synonym match ranks just below an equally close title match
+CATEGORY_MATCH_WEIGHT = 0.9
+
+# Jobs pulled from each index before re-ranking by similarity
+FUZZY_CANDIDATE_LIMIT = 200
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents so "électricien" and "electricien" compare equal"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def words_of(text: str) -> List[str]:
+    return re.findall(r"\w+", fold(text))
+
+
+def trigrams(word: str) -> FrozenSet[str]:
+    # Padding makes the first and last letters count, which is where typos hurt least
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def best_word_similarity(query_grams: List[FrozenSet[str]], text: str) -> float:
+    """Mean over query words of the closest word in text"""
+
+    if not query_grams:
+        return 0.0
+
+    text_grams = [trigrams(word) for word in words_of(text)]
+    if not text_grams:
+        return 0.0
+
+    return sum(max(similarity(q, t) for t in text_grams) for q in query_grams) / len(query_grams)
+
+
+def build_trigram_match(q: str) -> str:
+    """FTS5 query OR-ing every trigram of the query words, for the jobs_trigram index"""
+
+    grams = set()
+    for word in re.findall(r"\w+", q.lower()) + words_of(q):
+        grams.update(word[i:i + 3] for i in range(len(word) - 2))
+
+    # Words are \w only, so quoting each trigram is enough to keep FTS5 syntax out
+    return " OR ".join(f'"{gram}"' for gram in sorted(grams))
+
+
+# Every category label and synonym as (category, trigram sets of its words)
+_SYNONYM_TERMS = [
+    (category, [trigrams(word) for word in words_of(term)])
+    for category, terms in CATEGORY_SYNONYMS.items()
+    for term in terms
+] + [
+    (category, [trigrams(word) for word in words_of(category)])
+    for category in JOB_CATEGORIES
+]
+
+
+def match_categories(q: str) -> Dict[str, float]:
+    """Categories whose label or a synonym in any language resembles the query"""
+
+    query_grams = [trigrams(word) for word in words_of(q)]
+    matches: Dict[str, float] = {}
+
+    for category, term_grams in _SYNONYM_TERMS:
+        if not term_grams:
+            continue
+        # Best match of any query word against any word of the term
+        score = max(similarity(q_grams, t) for q_grams in query_grams for t in term_grams) if query_grams else 0.0
+        if score >= FUZZY_MIN_SIMILARITY and score > matches.get(category, 0.0):
+            matches[category] = score
+
+    return matches
@@ -0,0 +1,71 @@
+import math
+from collections import deque
+from typing import Dict, Tuple
+from app.core.constants import RWANDA_DISTRICTS, DISTRICT_CENTROIDS, DISTRICT_NEIGHBOURS
+
+
+def _haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+
+def _build_adjacency() -> Dict[str, set]:
+    adjacency = {district: set() for district in RWANDA_DISTRICTS}
+    for district, neighbours in DISTRICT_NEIGHBOURS.items():
+        for neighbour in neighbours:
+            adjacency[district].add(neighbour)
+            adjacency[neighbour].add(district)
+    return adjacency
+
+
+def _build_hops(adjacency: Dict[str, set]) -> Dict[str, Dict[str, int]]:
+    hops = {}
+    for origin in RWANDA_DISTRICTS:
+        distances = {origin: 0}
+        queue = deque([origin])
+        while queue:
+            current = queue.popleft()
+            for neighbour in adjacency[current]:
+                if neighbour not in distances:
+                    distances[neighbour] = distances[current] + 1
+                    queue.append(neighbour)
+        hops[origin] = distances
+    return hops
+
+
+# Both matrices are computed once at import; requests only read them
+DISTRICT_ADJACENCY = _build_adjacency()
+DISTRICT_HOPS = _build_hops(DISTRICT_ADJACENCY)
+DISTRICT_KM = {
+    origin: {
+        other: round(_haversine_km(DISTRICT_CENTROIDS[origin], DISTRICT_CENTROIDS[other]), 1)
+        for other in RWANDA_DISTRICTS
+    }
+    for origin in RWANDA_DISTRICTS
+}
+
+
+def parse_radius(radius: str) -> Tuple[str, float]:
+    """Parse '2' / '2hops' as graph hops or '25km' as kilometres between centroids"""
+
+    value = radius.strip().lower()
+    unit = "hops"
+
+    if value.endswith("km"):
+        unit, value = "km", value[:-2]
+    elif value.endswith("hops"):
+        value = value[:-4]
+
+    amount = float(value)
+    if amount < 0 or math.isnan(amount):
+        raise ValueError("radius must not be negative")
+
+    return unit, amount
+
+
+def districts_near(district: str, unit: str, amount: float) -> Dict[str, float]:
+    """Districts within the radius of district, mapped to their distance from it"""
+
+    matrix = DISTRICT_KM if unit == "km" else DISTRICT_HOPS
+    return {other: distance for other, distance in matrix[district].items() if distance <= amount}
@@ -0,0 +1,34 @@
+from typing import Callable, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models.job import Job
+from app.core.cache import bump_jobs_version
+
+# In-memory indexes over jobs subscribe here to be told about committed job writes
+_listeners: List[Callable] = []
+
+# Columns handed to listeners for each changed job
+JOB_EVENT_COLUMNS = (
+    Job.id, Job.employer_id, Job.title, Job.category, Job.district, Job.salary, Job.status, Job.created_at
+)
+
+
+def on_jobs_changed(listener: Callable[[List[Tuple[str, Optional[object]]]], None]):
+    """Register listener(changes); each change is (job_id, row) with row None once the job is deleted"""
+    _listeners.append(listener)
+    return listener
+
+
+def jobs_changed(db: Session, job_ids: Iterable[str]):
+    """Call after committing writes to jobs: bumps the listing version and notifies listeners"""
+
+    bump_jobs_version()
+
+    job_ids = list(job_ids)
+    if not _listeners or not job_ids:
+        return
+
+    rows = {row.id: row for row in db.query(*JOB_EVENT_COLUMNS).filter(Job.id.in_(job_ids)).all()}
+    changes = [(job_id, rows.get(job_id)) for job_id in job_ids]
+
+    for listener in _listeners:
+        listener(changes)
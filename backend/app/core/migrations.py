@@ -0,0 +1,132 @@
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from app.database import Base
+
+logger = logging.getLogger(__name__)
+
+# Indexes replaced by the composite ones declared on the models
+OBSOLETE_INDEXES = [
+    "ix_jobs_status",
+    "ix_jobs_employer_id",
+    "ix_applications_user_id",
+    "ix_work_sessions_user_id",
+    "ix_work_sessions_employer_id",
+    "ix_work_sessions_start_approved",
+    "ix_work_sessions_end_approved",
+    "ix_work_sessions_work_started",
+    "ix_work_sessions_work_ended",
+]
+
+# Which duplicate application survives: the one furthest along
+_APPLICATION_STATUS_RANK = (
+    "CASE status WHEN 'accepted' THEN 0 WHEN 'reviewing' THEN 1 "
+    "WHEN 'pending' THEN 2 WHEN 'rejected' THEN 3 ELSE 4 END"
+)
+
+# Rows per transaction when backfilling work_sessions.state, so app writes are not locked out for long
+STATE_BACKFILL_BATCH_SIZE = 5000
+
+# work_sessions.state derived from the lifecycle flags it replaces as the filter column
+_WORK_SESSION_STATE = (
+    "CASE WHEN end_approved = 1 THEN 'completed' "
+    "WHEN work_ended = 1 THEN 'pending_end' "
+    "WHEN work_started = 1 THEN 'active' "
+    "WHEN start_approved = 1 THEN 'start_approved' "
+    "ELSE 'pending_start' END"
+)
+
+
+def add_missing_columns(conn) -> set:
+    """ALTER in columns added to the models since the table was created"""
+
+    added = set()
+    inspector = inspect(conn)
+
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}"
+            if column.server_default is not None:
+                default = column.server_default.arg
+                if isinstance(default, str):
+                    default = "'" + default.replace("'", "''") + "'"
+                else:
+                    default = default.text
+                ddl += f" DEFAULT {default}"
+
+            conn.execute(text(ddl))
+            added.add(f"{table.name}.{column.name}")
+
+    return added
+
+
+def backfill_work_session_states(engine: Engine):
+    """Set state on rows written before the column existed, one rowid range per transaction"""
+
+    last = 0
+    while True:
+        with engine.begin() as conn:
+            upper = conn.execute(text(
+                "SELECT MAX(rowid) FROM "
+                "(SELECT rowid FROM work_sessions WHERE rowid > :last ORDER BY rowid LIMIT :size)"
+            ), {"last": last, "size": STATE_BACKFILL_BATCH_SIZE}).scalar()
+
+            if upper is None:
+                return
+
+            conn.execute(text(
+                f"UPDATE work_sessions SET state = {_WORK_SESSION_STATE} WHERE rowid > :last AND rowid <= :upper"
+            ), {"last": last, "upper": upper})
+
+        last = upper
+
+
+def run_migrations(engine: Engine):
+    """Bring an existing database up to date with the models (create_all only adds missing tables)"""
+
+    with engine.begin() as conn:
+        added = add_missing_columns(conn)
+
+        if "jobs.updated_at" in added:
+            conn.execute(text("UPDATE jobs SET updated_at = created_at"))
+
+        if "jobs.employer_name" in added:
+            conn.execute(text(
+                "UPDATE jobs SET employer_name = "
+                "(SELECT company_name FROM employers WHERE employers.id = jobs.employer_id)"
+            ))
+
+        if not inspect(conn).has_index("applications", "ux_applications_user_job"):
+            # Double-taps from before the unique index. Keep the one furthest along so
+            # a hire is never undone, the earliest of those on a tie.
+            removed = conn.execute(text(
+                "DELETE FROM applications WHERE rowid IN ("
+                "SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER ("
+                "PARTITION BY user_id, job_id ORDER BY "
+                f"{_APPLICATION_STATUS_RANK}, created_at, rowid) AS position FROM applications) "
+                "WHERE position > 1) RETURNING id, user_id, job_id, status"
+            )).all()
+            for row in removed:
+                logger.warning(
+                    "Removed duplicate application %s (user %s, job %s, status %s)",
+                    row.id, row.user_id, row.job_id, row.status
+                )
+
+        # The state indexes are built last, so until they exist a backfill may not have finished
+        backfill_states = not inspect(conn).has_index("work_sessions", "ix_work_sessions_employer_state_created_at")
+
+    if backfill_states:
+        backfill_work_session_states(engine)
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
@@ -0,0 +1,64 @@
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+# Header carrying the cursor of the next page, sent whenever a page comes back full
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Encode the (created_at, id) position of a row as an opaque cursor"""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page_query(query, model, skip: int, limit: int, cursor: Optional[str]):
+    """Order newest first and narrow the query to one page"""
+
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit)
+
+
+def paginate(query, model, skip: int, limit: int, cursor: Optional[str], response: Response):
+    """Return one page of rows, using keyset paging when a cursor is given"""
+
+    rows = page_query(query, model, skip, limit, cursor).all()
+
+    next_cursor = next_cursor_for(rows, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return rows
+
+
+def next_cursor_for(rows, limit: int) -> Optional[str]:
+    """Cursor of the page after rows, or None when rows is the last page"""
+
+    if len(rows) < limit:
+        return None
+
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
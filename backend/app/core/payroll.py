@@ -0,0 +1,138 @@
+import io
+import csv
+import json
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+from sqlalchemy import and_, or_
+from app.database import SessionLocal
+from app.models.work_tracking import WorkSession
+from app.models.user import User
+from app.models.job import Job
+
+# Sessions read per query while exporting; each batch is also one chunk of the response
+PAYROLL_BATCH_SIZE = 1000
+
+PAYROLL_FIELDS = [
+    "record", "session_id", "worker_id", "worker_name", "job_id", "job_title", "state",
+    "created_at", "start_time", "end_time", "sessions", "hours_worked", "daily_payment", "approved_payment"
+]
+
+PAYROLL_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _subtotal(record: str, **labels) -> dict:
+    return {"record": record, **labels, "sessions": 0, "hours_worked": 0.0, "daily_payment": 0, "approved_payment": 0}
+
+
+def _add(subtotal: dict, row: dict):
+    subtotal["sessions"] += 1
+    subtotal["hours_worked"] += row["hours_worked"] or 0.0
+    subtotal["daily_payment"] += row["daily_payment"]
+    subtotal["approved_payment"] += row["approved_payment"]
+
+
+def _read_batches(employer_id: str, start: Optional[datetime], end: Optional[datetime]) -> Iterator[list]:
+    """Oldest first, one keyset page per short-lived session
+
+    SQLite holds a shared lock for as long as a read transaction is open, which
+    would stall every writer while a slow client downloads; paging releases it
+    between batches and keeps memory to one batch.
+    """
+
+    last = None
+    while True:
+        with SessionLocal() as db:
+            query = db.query(
+                WorkSession.id, WorkSession.user_id, WorkSession.job_id, WorkSession.state,
+                WorkSession.created_at, WorkSession.start_time, WorkSession.end_time,
+                WorkSession.hours_worked, WorkSession.daily_payment,
+                (User.first_name + " " + User.last_name).label("worker_name"),
+                Job.title.label("job_title")
+            ).join(User, User.id == WorkSession.user_id).join(Job, Job.id == WorkSession.job_id).filter(
+                WorkSession.employer_id == employer_id
+            )
+
+            if start is not None:
+                query = query.filter(WorkSession.created_at >= start)
+            if end is not None:
+                query = query.filter(WorkSession.created_at < end)
+            if last is not None:
+                query = query.filter(or_(
+                    WorkSession.created_at > last.created_at,
+                    and_(WorkSession.created_at == last.created_at, WorkSession.id > last.id)
+                ))
+
+            rows = query.order_by(WorkSession.created_at, WorkSession.id).limit(PAYROLL_BATCH_SIZE).all()
+
+        if not rows:
+            return
+
+        yield rows
+        last = rows[-1]
+
+
+def payroll_records(employer_id: str, start: Optional[datetime], end: Optional[datetime]) -> Iterator[list]:
+    """Batches of session records, then the per-worker, per-job and overall subtotals
+
+    Only sessions whose end was approved count towards approved_payment.
+    """
+
+    workers: Dict[str, dict] = {}
+    jobs: Dict[str, dict] = {}
+    total = _subtotal("total")
+
+    for rows in _read_batches(employer_id, start, end):
+        records = []
+        for row in rows:
+            record = {
+                "record": "session",
+                "session_id": row.id,
+                "worker_id": row.user_id,
+                "worker_name": row.worker_name,
+                "job_id": row.job_id,
+                "job_title": row.job_title,
+                "state": row.state,
+                "created_at": row.created_at,
+                "start_time": row.start_time,
+                "end_time": row.end_time,
+                "sessions": 1,
+                "hours_worked": row.hours_worked,
+                "daily_payment": row.daily_payment,
+                "approved_payment": row.daily_payment if row.state == "completed" else 0
+            }
+            records.append(record)
+
+            if row.user_id not in workers:
+                workers[row.user_id] = _subtotal("worker", worker_id=row.user_id, worker_name=row.worker_name)
+            if row.job_id not in jobs:
+                jobs[row.job_id] = _subtotal("job", job_id=row.job_id, job_title=row.job_title)
+            for subtotal in (workers[row.user_id], jobs[row.job_id], total):
+                _add(subtotal, record)
+
+        yield records
+
+    yield list(workers.values()) + list(jobs.values()) + [total]
+
+
+def format_csv(batches: Iterator[list]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=PAYROLL_FIELDS)
+    writer.writeheader()
+
+    for records in batches:
+        writer.writerows(records)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def format_ndjson(batches: Iterator[list]) -> Iterator[str]:
+    # Records only hold str, numbers, None and datetimes; json.dumps with an isoformat
+    # fallback is several times faster than jsonable_encoder per record
+    for records in batches:
+        yield "".join(json.dumps(record, default=datetime.isoformat) + "\n" for record in records)
+
+
+def stream_payroll(employer_id: str, start: Optional[datetime], end: Optional[datetime], format: str) -> Iterator[str]:
+    batches = payroll_records(employer_id, start, end)
+    return format_csv(batches) if format == "csv" else format_ndjson(batches)
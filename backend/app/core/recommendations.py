@@ -0,0 +1,221 @@
+import time
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.job import Job
+from app.models.user import User
+from app.models.application import Application
+from app.models.work_tracking import WorkSession
+from app.core.geo import DISTRICT_HOPS
+from app.core.job_events import JOB_EVENT_COLUMNS, on_jobs_changed
+
+# Relative weight of each signal in a job's score
+CATEGORY_WEIGHT = 3.0
+DISTRICT_WEIGHT = 2.0
+SALARY_WEIGHT = 1.0
+RECENCY_WEIGHT = 1.0
+
+# An accepted application says more about what a worker does than one they only sent
+ACCEPTED_APPLICATION_WEIGHT = 3.0
+RECENCY_DECAY_DAYS = 14.0
+
+_INITIAL_CAPACITY = 1024
+
+
+def _epoch(value: datetime) -> float:
+    # SQLite hands back naive datetimes that were written as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class JobFeatureMatrix:
+    """Column arrays of the features of every active job, one slot per job
+
+    Built lazily from the database on first use, then kept current from job
+    change events so a request only has to score the arrays.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._categories: Dict[str, int] = {}
+        self._districts: Dict[str, int] = {}
+        self._allocate(_INITIAL_CAPACITY)
+
+    def _allocate(self, capacity: int):
+        self.job_ids = np.empty(capacity, dtype=object)
+        self.category = np.full(capacity, -1, dtype=np.int32)
+        self.district = np.full(capacity, -1, dtype=np.int32)
+        self.salary = np.zeros(capacity, dtype=np.float64)
+        self.created = np.zeros(capacity, dtype=np.float64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self._size = 0
+
+    def _grow(self):
+        size = self._size
+        old = (self.job_ids, self.category, self.district, self.salary, self.created, self.active)
+        self._allocate(len(self.job_ids) * 2)
+        for new, current in zip((self.job_ids, self.category, self.district, self.salary, self.created, self.active), old):
+            new[:size] = current[:size]
+        self._size = size
+
+    @staticmethod
+    def _code(codes: Dict[str, int], value: str) -> int:
+        return codes.setdefault(value, len(codes))
+
+    def _upsert(self, row):
+        slot = self._slots.get(row.id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                if self._size == len(self.job_ids):
+                    self._grow()
+                slot = self._size
+                self._size += 1
+            self._slots[row.id] = slot
+
+        self.job_ids[slot] = row.id
+        self.category[slot] = self._code(self._categories, row.category)
+        self.district[slot] = self._code(self._districts, row.district)
+        self.salary[slot] = row.salary
+        self.created[slot] = _epoch(row.created_at)
+        self.active[slot] = True
+
+    def _remove(self, job_id: str):
+        slot = self._slots.pop(job_id, None)
+        if slot is not None:
+            self.active[slot] = False
+            self.job_ids[slot] = None
+            self._free.append(slot)
+
+    def apply_changes(self, changes):
+        """Job change listener: keep active jobs in the matrix and drop the rest"""
+
+        with self._lock:
+            # Until the first build there is nothing to keep current
+            if not self._built:
+                return
+
+            for job_id, row in changes:
+                if row is None or row.status != "active":
+                    self._remove(job_id)
+                else:
+                    self._upsert(row)
+
+    def ensure_built(self, db: Session):
+        with self._lock:
+            if self._built:
+                return
+
+            rows = db.query(*JOB_EVENT_COLUMNS).filter(Job.status == "active").yield_per(5000)
+            for row in rows:
+                self._upsert(row)
+            self._built = True
+
+    def top_k(self, profile: "WorkerProfile", k: int) -> List[str]:
+        """Ids of the k best scoring active jobs for profile, best first"""
+
+        with self._lock:
+            size = self._size
+            if size == 0 or k <= 0:
+                return []
+
+            category = self.category[:size]
+            district = self.district[:size]
+
+            # Per-code lookup vectors turn every per-job signal into one fancy-index
+            category_affinity = np.zeros(len(self._categories) + 1)
+            for name, weight in profile.category_affinity.items():
+                code = self._categories.get(name)
+                if code is not None:
+                    category_affinity[code] = weight
+
+            district_affinity = np.zeros(len(self._districts) + 1)
+            hops = DISTRICT_HOPS.get(profile.district, {})
+            for name, code in self._districts.items():
+                if name in hops:
+                    district_affinity[code] = 1.0 / (1.0 + hops[name])
+
+            if profile.target_salary:
+                salary_score = np.clip(self.salary[:size] / profile.target_salary, 0.0, 2.0) / 2.0
+            else:
+                salary_score = np.zeros(size)
+
+            age_days = (time.time() - self.created[:size]) / 86400.0
+            recency = np.exp(-np.maximum(age_days, 0.0) / RECENCY_DECAY_DAYS)
+
+            scores = (
+                CATEGORY_WEIGHT * category_affinity[category]
+                + DISTRICT_WEIGHT * district_affinity[district]
+                + SALARY_WEIGHT * salary_score
+                + RECENCY_WEIGHT * recency
+            )
+
+            candidates = self.active[:size].copy()
+            for job_id in profile.applied_job_ids:
+                slot = self._slots.get(job_id)
+                if slot is not None:
+                    candidates[slot] = False
+            scores[~candidates] = -np.inf
+
+            k = min(k, int(candidates.sum()))
+            if k == 0:
+                return []
+
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [self.job_ids[slot] for slot in top]
+
+    def median_salary(self) -> Optional[float]:
+        with self._lock:
+            salaries = self.salary[:self._size][self.active[:self._size]]
+            return float(np.median(salaries)) if salaries.size else None
+
+
+class WorkerProfile:
+    """What a worker's history says about the jobs they want"""
+
+    def __init__(self, district: str, category_affinity: Dict[str, float], applied_job_ids: set, target_salary: Optional[float]):
+        self.district = district
+        self.category_affinity = category_affinity
+        self.applied_job_ids = applied_job_ids
+        self.target_salary = target_salary
+
+
+def build_worker_profile(db: Session, user: User, matrix: JobFeatureMatrix) -> WorkerProfile:
+    applications = db.query(Application.job_id, Application.status, Job.category).join(
+        Job, Job.id == Application.job_id
+    ).filter(Application.user_id == user.id).all()
+
+    weights: Dict[str, float] = {}
+    for application in applications:
+        weight = ACCEPTED_APPLICATION_WEIGHT if application.status == "accepted" else 1.0
+        weights[application.category] = weights.get(application.category, 0.0) + weight
+
+    total = sum(weights.values())
+    category_affinity = {name: weight / total for name, weight in weights.items()} if total else {}
+
+    # Pitch jobs around what the worker has actually been paid, or the going rate without history
+    earnings = db.query(func.avg(WorkSession.daily_payment)).filter(
+        WorkSession.user_id == user.id,
+        WorkSession.state == "completed"
+    ).scalar()
+    target_salary = float(earnings) if earnings else matrix.median_salary()
+
+    return WorkerProfile(
+        district=user.district,
+        category_affinity=category_affinity,
+        applied_job_ids={application.job_id for application in applications},
+        target_salary=target_salary
+    )
+
+
+job_feature_matrix = JobFeatureMatrix()
+on_jobs_changed(job_feature_matrix.apply_changes)
@@ -0,0 +1,76 @@
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.core.triggers import install_triggers, drop_triggers
+
+# What one work session adds to its worker's and employer's summary. Same
+# conditions as the summary query; "x IS y" is never NULL.
+_CONTRIBUTIONS = {
+    "total_sessions": "1",
+    "approved_sessions": "({r}.state IS 'completed')",
+    "total_earnings": "CASE WHEN {r}.state IS 'completed' THEN {r}.daily_payment ELSE 0 END",
+    "pending_start_approval": "({r}.state IS 'pending_start')",
+    "pending_end_approval": "({r}.state IS 'pending_end')",
+    "total_hours": "CASE WHEN {r}.state IS 'completed' THEN IFNULL({r}.hours_worked, 0) ELSE 0 END",
+}
+
+_PRINCIPALS = {"user": "user_id", "employer": "employer_id"}
+
+_COLUMNS = ", ".join(_CONTRIBUTIONS)
+_ACCUMULATE = ", ".join(f"{column} = {column} + excluded.{column}" for column in _CONTRIBUTIONS)
+
+
+def _apply(ref: str, sign: str) -> str:
+    """Add (sign "") or take back (sign "-") the contribution of row ref to both summaries"""
+
+    values = ", ".join(f"{sign}({expression.format(r=ref)})" for expression in _CONTRIBUTIONS.values())
+    return "\n".join(
+        f"INSERT INTO work_session_rollups(principal_type, principal_id, {_COLUMNS}) "
+        f"VALUES ('{principal_type}', {ref}.{column}, {values}) "
+        f"ON CONFLICT(principal_type, principal_id) DO UPDATE SET {_ACCUMULATE};"
+        for principal_type, column in _PRINCIPALS.items()
+    )
+
+
+_ROLLUP_TRIGGERS = {
+    "work_session_rollups_ai": f"""
+    CREATE TRIGGER IF NOT EXISTS work_session_rollups_ai AFTER INSERT ON work_sessions
+    BEGIN
+        {_apply("new", "")}
+    END
+    """,
+    "work_session_rollups_ad": f"""
+    CREATE TRIGGER IF NOT EXISTS work_session_rollups_ad AFTER DELETE ON work_sessions
+    BEGIN
+        {_apply("old", "-")}
+    END
+    """,
+    "work_session_rollups_au": f"""
+    CREATE TRIGGER IF NOT EXISTS work_session_rollups_au AFTER UPDATE OF
+        user_id, employer_id, daily_payment, hours_worked, state
+    ON work_sessions
+    BEGIN
+        {_apply("old", "-")}
+        {_apply("new", "")}
+    END
+    """,
+}
+
+
+_SUMS = ", ".join(f"SUM({expression.format(r='work_sessions')})" for expression in _CONTRIBUTIONS.values())
+
+_ROLLUP_SEED = ["DELETE FROM work_session_rollups"] + [
+    f"INSERT INTO work_session_rollups(principal_type, principal_id, {_COLUMNS}) "
+    f"SELECT '{principal_type}', {column}, {_SUMS} FROM work_sessions GROUP BY {column}"
+    for principal_type, column in _PRINCIPALS.items()
+]
+
+
+def init_work_session_rollups(engine: Engine):
+    """Install the rollup triggers (seeding the table) when enabled, remove them when not"""
+
+    if not settings.WORK_SESSION_ROLLUPS:
+        # Drop them so a later re-enable reseeds instead of trusting rows that went stale
+        drop_triggers(engine, _ROLLUP_TRIGGERS, ["DELETE FROM work_session_rollups"])
+        return
+
+    install_triggers(engine, "work_session_rollups_ai", _ROLLUP_TRIGGERS.values(), _ROLLUP_SEED)
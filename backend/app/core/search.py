@@ -0,0 +1,150 @@
+import re
+import logging
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# Set by init_job_search() at startup
+_fts_available = False
+_trigram_available = False
+
+# Only active jobs are indexed; the triggers keep jobs_fts in step with jobs
+# (see app.core.triggers for why triggers)
+_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, description, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs
+    WHEN new.status = 'active'
+    BEGIN
+        INSERT INTO jobs_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs
+    BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.rowid;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description, status ON jobs
+    BEGIN
+        DELETE FROM jobs_fts WHERE rowid = old.rowid;
+        INSERT INTO jobs_fts(rowid, title, description)
+        SELECT new.rowid, new.title, new.description WHERE new.status = 'active';
+    END
+    """,
+]
+
+# Trigram index over titles and categories for typo-tolerant search. Same
+# sync rules as jobs_fts; needs the FTS5 trigram tokenizer (SQLite 3.34+).
+_TRIGRAM_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_trigram USING fts5(
+        title, category, tokenize = 'trigram case_sensitive 0'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_trigram_ai AFTER INSERT ON jobs
+    WHEN new.status = 'active'
+    BEGIN
+        INSERT INTO jobs_trigram(rowid, title, category) VALUES (new.rowid, new.title, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_trigram_ad AFTER DELETE ON jobs
+    BEGIN
+        DELETE FROM jobs_trigram WHERE rowid = old.rowid;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_trigram_au AFTER UPDATE OF title, category, status ON jobs
+    BEGIN
+        DELETE FROM jobs_trigram WHERE rowid = old.rowid;
+        INSERT INTO jobs_trigram(rowid, title, category)
+        SELECT new.rowid, new.title, new.category WHERE new.status = 'active';
+    END
+    """,
+]
+
+
+def init_job_search(engine: Engine) -> bool:
+    """Create the jobs_fts index and its sync triggers if SQLite supports FTS5"""
+    global _fts_available
+
+    if engine.dialect.name != "sqlite":
+        _fts_available = False
+        return False
+
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")
+            ).first()
+
+            for statement in _FTS_DDL:
+                conn.execute(text(statement))
+
+            if not exists:
+                # Title matches weigh more than description matches
+                conn.execute(text("INSERT INTO jobs_fts(jobs_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')"))
+                conn.execute(text(
+                    "INSERT INTO jobs_fts(rowid, title, description) "
+                    "SELECT rowid, title, description FROM jobs WHERE status = 'active'"
+                ))
+    except OperationalError as exc:
+        logger.warning("FTS5 unavailable, job search falls back to LIKE scans: %s", exc)
+        _fts_available = False
+        return False
+
+    _fts_available = True
+    init_job_trigrams(engine)
+    return True
+
+
+def init_job_trigrams(engine: Engine) -> bool:
+    """Create the jobs_trigram index and its sync triggers if the trigram tokenizer exists"""
+    global _trigram_available
+
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_trigram'")
+            ).first()
+
+            for statement in _TRIGRAM_DDL:
+                conn.execute(text(statement))
+
+            if not exists:
+                conn.execute(text(
+                    "INSERT INTO jobs_trigram(rowid, title, category) "
+                    "SELECT rowid, title, category FROM jobs WHERE status = 'active'"
+                ))
+    except OperationalError as exc:
+        logger.warning("FTS5 trigram tokenizer unavailable, fuzzy search falls back to plain search: %s", exc)
+        _trigram_available = False
+        return False
+
+    _trigram_available = True
+    return True
+
+
+def fts_enabled() -> bool:
+    return _fts_available
+
+
+def trigram_enabled() -> bool:
+    return _trigram_available
+
+
+def build_match_query(q: str) -> str:
+    """Turn free text into an FTS5 query of prefix-matched terms"""
+
+    # Keep word characters only so user input can never inject FTS5 syntax
+    terms = re.findall(r"\w+", q.lower())
+    return " ".join(f'"{term}"*' for term in terms)
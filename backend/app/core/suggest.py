@@ -0,0 +1,191 @@
+import heapq
+import bisect
+import threading
+from typing import Dict, List, Tuple
+from sqlalchemy.orm import Session
+from app.models.job import Job
+from app.core.constants import JOB_CATEGORIES
+from app.core.job_events import JOB_EVENT_COLUMNS, on_jobs_changed
+
+# Prefixes up to this long can match most of the index, so their matches are kept
+# ranked as counts change instead of being collected and ranked per lookup
+SUGGEST_BUCKET_PREFIX_LENGTH = 3
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class SuggestIndex:
+    """Sorted word-start suffixes of active job titles and the category labels
+
+    Every label is entered once per word, so "Plumber needed urgently" is found
+    by "plu", "nee" and "urg". Short prefixes read the head of a bucket kept in
+    rank order; longer ones bisect and rank every match. Job writes insert or
+    delete single entries instead of rebuilding.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        # (suffix, kind, key), kept sorted
+        self._entries: List[Tuple[str, str, str]] = []
+        # (kind, key) -> [label, count]
+        self._labels: Dict[Tuple[str, str], list] = {}
+        # job_id -> (title key, category) it is counted under
+        self._jobs: Dict[str, Tuple[str, str]] = {}
+        # short prefix -> ranks of the labels matching it, best first; kept once built
+        self._buckets: Dict[str, List[tuple]] = {}
+
+        for category in JOB_CATEGORIES:
+            self._add_label("category", category)
+
+    def _rank(self, kind: str, key: str) -> tuple:
+        label, count = self._labels[kind, key]
+        return (-count, len(label), label, kind, key)
+
+    @staticmethod
+    def _short_prefixes(key: str) -> set:
+        words = key.split(" ")
+        return {
+            suffix[:n]
+            for suffix in (" ".join(words[i:]) for i in range(len(words)))
+            for n in range(1, min(len(suffix), SUGGEST_BUCKET_PREFIX_LENGTH) + 1)
+        }
+
+    def _bucket(self, kind: str, key: str, add: bool):
+        rank = self._rank(kind, key)
+        for prefix in self._short_prefixes(key):
+            if add:
+                bisect.insort(self._buckets.setdefault(prefix, []), rank)
+            else:
+                bucket = self._buckets.get(prefix, [])
+                position = bisect.bisect_left(bucket, rank)
+                if position < len(bucket) and bucket[position] == rank:
+                    del bucket[position]
+
+    def _add_label(self, kind: str, label: str, keep_sorted: bool = True) -> Tuple[str, str]:
+        key = normalize(label)
+        entry = self._labels.get((kind, key))
+
+        if entry is None:
+            self._labels[(kind, key)] = [label, 0]
+            words = key.split(" ")
+            for i in range(len(words)):
+                item = (" ".join(words[i:]), kind, key)
+                if keep_sorted:
+                    bisect.insort(self._entries, item)
+                else:
+                    self._entries.append(item)
+            if self._built:
+                self._bucket(kind, key, add=True)
+
+        return kind, key
+
+    def _count(self, kind: str, key: str, delta: int):
+        entry = self._labels.get((kind, key))
+        if entry is None:
+            return
+
+        # The rank includes the count, so move the label within its buckets
+        if self._built:
+            self._bucket(kind, key, add=False)
+        entry[1] += delta
+
+        # Titles leave the index with their last job; categories always stay
+        if kind == "title" and entry[1] <= 0:
+            del self._labels[(kind, key)]
+            words = key.split(" ")
+            for i in range(len(words)):
+                item = (" ".join(words[i:]), kind, key)
+                position = bisect.bisect_left(self._entries, item)
+                if position < len(self._entries) and self._entries[position] == item:
+                    del self._entries[position]
+        elif self._built:
+            self._bucket(kind, key, add=True)
+
+    def _add_job(self, job_id: str, title: str, category: str, keep_sorted: bool = True):
+        _, title_key = self._add_label("title", title, keep_sorted)
+        self._count("title", title_key, 1)
+        self._count("category", normalize(category), 1)
+        self._jobs[job_id] = (title_key, category)
+
+    def _remove_job(self, job_id: str):
+        counted = self._jobs.pop(job_id, None)
+        if counted is not None:
+            title_key, category = counted
+            self._count("title", title_key, -1)
+            self._count("category", normalize(category), -1)
+
+    def apply_changes(self, changes):
+        """Job change listener: count active jobs and forget the rest"""
+
+        with self._lock:
+            if not self._built:
+                return
+
+            for job_id, row in changes:
+                self._remove_job(job_id)
+                if row is not None and row.status == "active":
+                    self._add_job(job_id, row.title, row.category)
+
+    def ensure_built(self, db: Session):
+        with self._lock:
+            if self._built:
+                return
+
+            rows = db.query(*JOB_EVENT_COLUMNS).filter(Job.status == "active").yield_per(5000)
+            # Append everything and sort once rather than insort per entry
+            for row in rows:
+                self._add_job(row.id, row.title, row.category, keep_sorted=False)
+            self._entries.sort()
+
+            # Fill the buckets once the counts are final, then keep them current
+            for kind, key in self._labels:
+                rank = self._rank(kind, key)
+                for prefix in self._short_prefixes(key):
+                    self._buckets.setdefault(prefix, []).append(rank)
+            for bucket in self._buckets.values():
+                bucket.sort()
+            self._built = True
+
+    def _longer_prefix(self, prefix: str, limit: int) -> List[tuple]:
+        # Every suffix starting with prefix sorts between these two
+        start = bisect.bisect_left(self._entries, (prefix,))
+        end = bisect.bisect_left(self._entries, (prefix + "\U0010ffff",), start)
+        bucket = self._buckets.get(prefix[:SUGGEST_BUCKET_PREFIX_LENGTH], [])
+
+        # Both ways look at every match: rank the matching entries, or walk the
+        # short prefix's bucket best first until limit labels match. Walking wins
+        # when matches are dense, e.g. "plum" among the "plu" labels.
+        if end - start and (end - start) ** 2 > limit * len(bucket):
+            needle = " " + prefix
+            best = []
+            for rank in bucket:
+                if needle in " " + rank[4]:
+                    best.append(rank)
+                    if len(best) == limit:
+                        break
+            return best
+
+        found = {(kind, key) for _, kind, key in self._entries[start:end]}
+        return heapq.nsmallest(limit, (self._rank(kind, key) for kind, key in found))
+
+    def suggest(self, prefix: str, limit: int) -> List[dict]:
+        """Labels with a word starting with prefix, most active jobs first"""
+
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            if len(prefix) <= SUGGEST_BUCKET_PREFIX_LENGTH:
+                best = self._buckets.get(prefix, [])[:limit]
+            else:
+                best = self._longer_prefix(prefix, limit)
+
+        return [{"label": label, "kind": kind, "count": -count} for count, _, label, kind, _ in best]
+
+
+suggest_index = SuggestIndex()
+on_jobs_changed(suggest_index.apply_changes)
@@ -0,0 +1,39 @@
+from typing import Iterable
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# Derived tables (facet counts, application counters, work-session rollups) are
+# kept by SQLite triggers rather than in application code: a trigger runs in the
+# same transaction as the write to its table, so the derived rows stay exact for
+# ORM writes, bulk statements, raw SQL and cascading deletes alike.
+
+
+def install_triggers(engine: Engine, probe_name: str, ddl: Iterable[str], seed_statements: Iterable[str]):
+    """Run the CREATE TRIGGER IF NOT EXISTS statements in ddl, seeding the first time
+
+    probe_name is one of the triggers; if it was not there before, the seed
+    statements run in the same transaction to rebuild the derived rows from
+    scratch, since nothing kept them up to date until now.
+    """
+
+    with engine.begin() as conn:
+        installed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"), {"name": probe_name}
+        ).first()
+
+        for statement in ddl:
+            conn.execute(text(statement))
+
+        if not installed:
+            for statement in seed_statements:
+                conn.execute(text(statement))
+
+
+def drop_triggers(engine: Engine, names: Iterable[str], cleanup_statements: Iterable[str] = ()):
+    """Drop the named triggers and run the cleanup statements in one transaction"""
+
+    with engine.begin() as conn:
+        for name in names:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        for statement in cleanup_statements:
+            conn.execute(text(statement))
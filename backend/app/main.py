@@ -1,16 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.database import engine, Base
-from app.api.v1 import auth, jobs, users, employers, applications, admin, work_tracking
+from app.core.migrations import run_migrations
+from app.core.search import init_job_search
+from app.core.facets import init_job_facets
+from app.core.counters import init_application_counters
+from app.core.rollups import init_work_session_rollups
+from app.core.expiry import run_expiry_sweeper
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.api.v1 import auth, jobs, users, employers, applications, admin, work_tracking, events
 
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+init_job_search(engine)
+init_job_facets(engine)
+init_application_counters(engine)
+init_work_session_rollups(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweeper = None
+    if settings.JOB_EXPIRY_SWEEP_SECONDS > 0:
+        sweeper = asyncio.create_task(run_expiry_sweeper())
+
+    yield
+
+    if sweeper:
+        sweeper.cancel()
+
 
 app = FastAPI(
     title="KaziNiKazi",
     description="Job marketplace platform for Rwanda's informal sector - MVP",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -19,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(auth.router, prefix="/api/v1")
@@ -28,6 +57,7 @@ app.include_router(employers.router, prefix="/api/v1")
 app.include_router(applications.router, prefix="/api/v1")
 app.include_router(admin.router, prefix="/api/v1")
 app.include_router(work_tracking.router, prefix="/api/v1")
+app.include_router(events.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -3,5 +3,7 @@ from app.models.employer import Employer
 from app.models.admin import Admin
 from app.models.job import Job
 from app.models.application import Application
+from app.models.job_facet import JobFacetCount
+from app.models.work_session_rollup import WorkSessionRollup
 
-__all__ = ["User", "Employer", "Admin", "Job", "Application"]
\ No newline at end of file
+__all__ = ["User", "Employer", "Admin", "Job", "Application", "JobFacetCount", "WorkSessionRollup"]
\ No newline at end of file
@@ -2,18 +2,22 @@ import uuid
 from app.database import Base
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # One application per worker per job, enforced by the database rather than a pre-check
+        Index("ux_applications_user_job", "user_id", "job_id", unique=True),
+    )
 
     id = Column(String(50), primary_key=True, default=lambda: str(uuid.uuid4()))
 
-    user_id = Column(String(50), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(String(50), ForeignKey("users.id"), nullable=False)
     job_id = Column(String(50), ForeignKey("jobs.id"), nullable=False, index=True)
 
     status = Column(String(50), default="pending", index=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc), index=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
 
     user = relationship("User", back_populates="applications")
     job = relationship("Job", back_populates="applications")
\ No newline at end of file
@@ -16,6 +16,6 @@ class Employer(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
     district = Column(String(30), nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     jobs = relationship("Job", back_populates="employer")
\ No newline at end of file
@@ -2,10 +2,20 @@ import uuid
 from app.database import Base
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Index
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Match the filter + newest-first sort of list_jobs, search_jobs and get_my_jobs
+        Index("ix_jobs_status_created_at", "status", "created_at", "id"),
+        Index("ix_jobs_status_category_created_at", "status", "category", "created_at", "id"),
+        Index("ix_jobs_status_district_created_at", "status", "district", "created_at", "id"),
+        Index("ix_jobs_employer_created_at", "employer_id", "created_at", "id"),
+        Index("ix_jobs_employer_status_created_at", "employer_id", "status", "created_at", "id"),
+        # Lets the deadline sweep find expired active jobs without a scan
+        Index("ix_jobs_status_deadline", "status", "application_deadline"),
+    )
 
     id = Column(String(50), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False, index=True)
@@ -14,11 +24,20 @@ class Job(Base):
     category = Column(String(100), nullable=False, index=True)
     district = Column(String(50), nullable=False, index=True)
     salary = Column(Integer, nullable=False)
-    status = Column(String(50), default="active", index=True)
+    status = Column(String(50), default="active")
     application_deadline = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc), index=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
-    employer_id = Column(String(50), ForeignKey("employers.id"), nullable=False, index=True)
+    employer_id = Column(String(50), ForeignKey("employers.id"), nullable=False)
+    # Copy of employers.company_name so job reads never need the employers table
+    employer_name = Column(String(255), nullable=True)
+
+    # Applications per status, kept current by triggers on applications (app/core/counters.py)
+    pending_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    reviewing_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    accepted_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    rejected_applications = Column(Integer, nullable=False, default=0, server_default="0")
 
     employer = relationship("Employer", back_populates="jobs")
     applications = relationship("Application", back_populates="job")
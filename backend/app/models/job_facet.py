@@ -0,0 +1,12 @@
+from app.database import Base
+from sqlalchemy import Column, String, Integer
+
+
+class JobFacetCount(Base):
+    __tablename__ = "job_facet_counts"
+
+    # Number of jobs per (status, category, district), maintained by triggers on jobs
+    status = Column(String(50), primary_key=True)
+    category = Column(String(100), primary_key=True)
+    district = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -16,6 +16,6 @@ class User(Base):
     date_of_birth = Column(DateTime, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     district = Column(String(50), nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     applications = relationship("Application", back_populates="user")
\ No newline at end of file
@@ -0,0 +1,17 @@
+from app.database import Base
+from sqlalchemy import Column, String, Integer, Float
+
+
+class WorkSessionRollup(Base):
+    __tablename__ = "work_session_rollups"
+
+    # Work session summary per ("user", user_id) and ("employer", employer_id),
+    # maintained by triggers on work_sessions when WORK_SESSION_ROLLUPS is on
+    principal_type = Column(String(20), primary_key=True)
+    principal_id = Column(String(50), primary_key=True)
+    total_sessions = Column(Integer, nullable=False, default=0)
+    approved_sessions = Column(Integer, nullable=False, default=0)
+    total_earnings = Column(Integer, nullable=False, default=0)
+    pending_start_approval = Column(Integer, nullable=False, default=0)
+    pending_end_approval = Column(Integer, nullable=False, default=0)
+    total_hours = Column(Float, nullable=False, default=0)
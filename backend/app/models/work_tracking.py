@@ -2,30 +2,39 @@ import uuid
 from app.database import Base
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Boolean, Float
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Boolean, Float, Index
 
 class WorkSession(Base):
     __tablename__ = "work_sessions"
+    __table_args__ = (
+        # Match the owner filter, optional state filter and newest-first sort of the session lists
+        Index("ix_work_sessions_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_work_sessions_user_state_created_at", "user_id", "state", "created_at", "id"),
+        Index("ix_work_sessions_employer_created_at", "employer_id", "created_at", "id"),
+        Index("ix_work_sessions_employer_state_created_at", "employer_id", "state", "created_at", "id"),
+    )
 
     id = Column(String(50), primary_key=True, default=lambda: str(uuid.uuid4()))
     
-    user_id = Column(String(50), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(String(50), ForeignKey("users.id"), nullable=False)
     job_id = Column(String(50), ForeignKey("jobs.id"), nullable=False, index=True)
-    employer_id = Column(String(50), ForeignKey("employers.id"), nullable=False, index=True)
+    employer_id = Column(String(50), ForeignKey("employers.id"), nullable=False)
     start_time = Column(DateTime, nullable=True)
     end_time = Column(DateTime, nullable=True)
     daily_payment = Column(Integer, nullable=False)
     hours_worked = Column(Float, nullable=True)
-    start_approved = Column(Boolean, default=False, index=True)
-    end_approved = Column(Boolean, default=False, index=True)
-    work_started = Column(Boolean, default=False, index=True)
-    work_ended = Column(Boolean, default=False, index=True)
+    start_approved = Column(Boolean, default=False)
+    end_approved = Column(Boolean, default=False)
+    work_started = Column(Boolean, default=False)
+    work_ended = Column(Boolean, default=False)
+    # Where the session is in its lifecycle, kept in step with the flags above: one of WORK_SESSION_STATES
+    state = Column(String(20), nullable=False, default="pending_start", server_default="pending_start")
     notes = Column(Text, nullable=True)
     employer_start_notes = Column(Text, nullable=True)
     employer_end_notes = Column(Text, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.now(timezone.utc), index=True)
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     user = relationship("User", backref="work_sessions")
     job = relationship("Job", backref="work_sessions")
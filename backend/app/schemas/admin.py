@@ -10,6 +10,13 @@ class AdminStats(BaseModel):
     total_applications: int
     pending_applications: int
 
+class CacheStats(BaseModel):
+    size: int
+    max_entries: int
+    ttl_seconds: Optional[float]
+    hits: int
+    misses: int
+
 class UserResponse(BaseModel):
     id: str
     first_name: str
@@ -45,6 +52,7 @@ class JobResponse(BaseModel):
     salary: int
     status: str
     employer_id: str
+    employer_name: Optional[str] = None
     created_at: datetime
 
     class Config:
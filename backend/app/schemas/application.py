@@ -1,3 +1,4 @@
+from typing import List
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -25,4 +26,16 @@ class ApplicationDetailResponse(ApplicationResponse):
     job_title: str
     job_company: str
 
-    
\ No newline at end of file
+    
+
+class ApplicationStatusChange(BaseModel):
+    application_id: str
+    status: str
+
+class ApplicationBulkStatusUpdate(BaseModel):
+    changes: List[ApplicationStatusChange]
+    reject_remaining: bool = False
+
+class ApplicationBulkStatusResponse(BaseModel):
+    updated: int
+    rejected: int
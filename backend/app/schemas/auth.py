@@ -39,6 +39,10 @@ class Login(BaseModel):
     email: EmailStr
     password: str
 
+class StreamTicketResponse(BaseModel):
+    ticket: str
+    expires_in: int
+
 class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
 
@@ -24,4 +25,39 @@ class EmployerResponse(EmployerBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class EmployerDashboardJob(BaseModel):
+    id: str
+    title: str
+    slug: str
+    status: str
+    created_at: datetime
+    application_deadline: Optional[datetime] = None
+    pending_applications: int
+    reviewing_applications: int
+    accepted_applications: int
+    rejected_applications: int
+    active_sessions: int
+    pending_start_approval: int
+    pending_end_approval: int
+
+
+class EmployerPayroll(BaseModel):
+    approved_sessions: int
+    total_paid: int
+    total_hours: float
+    pending_payment: int
+
+
+class EmployerDashboard(BaseModel):
+    jobs: List[EmployerDashboardJob]
+    pending_applications: int
+    reviewing_applications: int
+    accepted_applications: int
+    rejected_applications: int
+    active_sessions: int
+    pending_start_approval: int
+    pending_end_approval: int
+    payroll: EmployerPayroll
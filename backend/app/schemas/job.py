@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -26,11 +26,35 @@ class JobResponse(JobBase):
     slug: str
     status: str
     employer_id: str
+    employer_name: Optional[str] = None
     application_deadline: Optional[datetime] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class EmployerJobResponse(JobResponse):
+    pending_applications: int
+    reviewing_applications: int
+    accepted_applications: int
+    rejected_applications: int
+
 class JobDetailResponse(JobResponse):
-    employer_name: str 
\ No newline at end of file
+    employer_name: str
+
+class JobBulkRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class JobBulkCreateResponse(BaseModel):
+    created: int
+    job_ids: List[str]
+    errors: List[JobBulkRowError]
+
+class JobFacets(BaseModel):
+    categories: Dict[str, int]
+    districts: Dict[str, int] 
+class JobSuggestion(BaseModel):
+    label: str
+    kind: str
+    count: int
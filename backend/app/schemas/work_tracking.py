@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class WorkSessionCreate(BaseModel):
@@ -20,6 +20,20 @@ class WorkSessionApproveEnd(BaseModel):
     approved: bool = True
     employer_notes: Optional[str] = None
 
+class WorkSessionBulkApprove(BaseModel):
+    session_ids: List[str]
+    approved: bool = True
+    employer_notes: Optional[str] = None
+
+class WorkSessionBulkResult(BaseModel):
+    session_id: str
+    state: Optional[str] = None
+    error: Optional[str] = None
+
+class WorkSessionBulkApproveResponse(BaseModel):
+    updated: int
+    results: List[WorkSessionBulkResult]
+
 class WorkSessionResponse(BaseModel):
     id: str
     user_id: str
@@ -33,6 +47,7 @@ class WorkSessionResponse(BaseModel):
     end_approved: bool
     work_started: bool
     work_ended: bool
+    state: str
     notes: Optional[str]
     employer_start_notes: Optional[str]
     employer_end_notes: Optional[str]
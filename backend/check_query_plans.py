@@ -0,0 +1,106 @@
+"""Query-plan regression check for the job and work-session browsing queries.
+
+Builds every filter/sort combination served by list_jobs, search_jobs,
+fuzzy_search_jobs, get_my_jobs and the two work-session lists against a
+scratch SQLite database, runs EXPLAIN QUERY PLAN on it and exits non-zero if
+any plan scans the jobs or work_sessions table or sorts in a temp B-tree.
+
+    python check_query_plans.py
+"""
+import os
+import sys
+from itertools import product
+from datetime import datetime
+
+os.environ.setdefault("SECRET_KEY", "query-plan-check")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.job import Job
+from app.models.work_tracking import WorkSession
+from app.core.constants import WORK_SESSION_STATES
+from app.core.search import init_job_search
+from app.core.pagination import page_query, encode_cursor
+from app.core.migrations import run_migrations
+from app.api.v1.jobs import build_list_query, build_search_query, build_trigram_query, build_employer_jobs_query
+from app.api.v1.work_tracking import build_work_session_query, filter_by_state
+
+CURSOR = encode_cursor(datetime(2024, 1, 1), "00000000-0000-0000-0000-000000000000")
+
+
+def plan_of(db, query):
+    # Compile through SQLAlchemy so parameters are bound exactly as the routes bind them
+    compiled = query.statement.compile(dialect=db.bind.dialect)
+    params = compiled.construct_params()
+    processors = compiled._bind_processors
+    args = tuple(
+        processors[name](params[name]) if name in processors else params[name]
+        for name in compiled.positiontup
+    )
+    rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + compiled.string, args)
+    return [row[3] for row in rows]
+
+
+def problems_in(plan):
+    problems = []
+    for line in plan:
+        if line.startswith(("SCAN jobs", "SCAN work_sessions")) and "VIRTUAL TABLE" not in line:
+            problems.append("full scan")
+        if "USE TEMP B-TREE" in line:
+            problems.append("temp sort")
+    return problems
+
+
+def cases(db):
+    for category, district, min_salary, cursor in product(
+        [None, "Plumbing & Electrical"], [None, "Gasabo"], [None, 5000], [None, CURSOR]
+    ):
+        name = f"list_jobs category={category} district={district} min_salary={min_salary} cursor={bool(cursor)}"
+        query = build_list_query(db, "active", category, district, min_salary)
+        yield name, page_query(query, Job, 0, 20, cursor)
+
+    for category, district in product([None, "Plumbing & Electrical"], [None, "Gasabo"]):
+        name = f"search_jobs category={category} district={district}"
+        yield name, build_search_query(db, "plumber", district, category).offset(0).limit(20)
+
+    for category, district in product([None, "Plumbing & Electrical"], [None, "Gasabo"]):
+        name = f"fuzzy_search_jobs category={category} district={district}"
+        yield name, build_trigram_query(db, "plamber", district, category).limit(200)
+
+    for status, cursor in product([None, "active"], [None, CURSOR]):
+        name = f"get_my_jobs status={status} cursor={bool(cursor)}"
+        query = build_employer_jobs_query(db, "employer-id", status)
+        yield name, page_query(query, Job, 0, 20, cursor)
+
+    for owner, state, cursor in product(
+        [WorkSession.user_id, WorkSession.employer_id], [None] + WORK_SESSION_STATES, [None, CURSOR]
+    ):
+        name = f"work sessions by {owner.key} state={state} cursor={bool(cursor)}"
+        query = filter_by_state(build_work_session_query(db).filter(owner == "owner-id"), state)
+        yield name, page_query(query, WorkSession, 0, 20, cursor)
+
+
+def main():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    init_job_search(engine)
+    db = sessionmaker(bind=engine)()
+
+    failed = False
+    for name, query in cases(db):
+        plan = plan_of(db, query)
+        problems = problems_in(plan)
+        print(("FAIL " if problems else "ok   ") + name)
+        if problems:
+            failed = True
+            for line in plan:
+                print("       " + line)
+
+    db.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
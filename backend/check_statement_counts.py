@@ -0,0 +1,189 @@
+"""Statement-count regression check for the paged list routes and work-session actions.
+
+Seeds a scratch SQLite database, calls each list route through TestClient
+at several page sizes while counting the SQL statements sent to the engine,
+and exits non-zero if the count depends on the page size (an N+1 lazy load
+crept back in), differs from the expected count where one is pinned, or a
+page comes back short. Creating a work session and each lifecycle transition
+are checked against pinned counts the same way.
+
+    python check_statement_counts.py
+"""
+import os
+import sys
+import shutil
+import tempfile
+
+os.environ.setdefault("SECRET_KEY", "statement-count-check")
+
+# The engine points at ./kazinikazi.db; run against a scratch copy instead of the real one
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+SCRATCH_DIR = tempfile.mkdtemp()
+os.chdir(SCRATCH_DIR)
+
+from datetime import datetime
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import engine, SessionLocal
+from app.core.security import create_access_token
+from app.models.user import User
+from app.models.employer import Employer
+from app.models.job import Job
+from app.models.application import Application
+from app.models.work_tracking import WorkSession
+
+PAGE_SIZES = [1, 10, 100]
+ROWS = max(PAGE_SIZES)
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def statement_count(client, method, url, headers, **kwargs):
+    """(response, number of statements the request ran)"""
+
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        response = client.request(method, url, headers=headers, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+    if response.status_code >= 300:
+        raise SystemExit(f"{method} {url} failed: {response.status_code} {response.text}")
+
+    return response, counter.count
+
+
+def bearer(principal_id, user_type):
+    return {"Authorization": "Bearer " + create_access_token({"sub": principal_id, "user_type": user_type})}
+
+
+def seed():
+    """One employer with ROWS jobs, and ROWS workers who all applied to the first job
+
+    The first worker also applied to, was accepted for and has a work session on
+    every job, so every list has a full page at every size. The second worker is
+    accepted for the first job and has no session yet.
+    """
+
+    with SessionLocal() as db:
+        employer = Employer(
+            company_name="Check Ltd", phone_number="0700000000", email="employer@check.test",
+            hashed_password="x", district="Gasabo"
+        )
+        db.add(employer)
+        db.flush()
+
+        jobs = [
+            Job(
+                title=f"Job {i}", slug=f"job-{i}", description="Statement count check job",
+                category="General Labor", district="Gasabo", salary=5000,
+                employer_id=employer.id, employer_name=employer.company_name
+            )
+            for i in range(ROWS)
+        ]
+        users = [
+            User(
+                first_name="Wor", last_name=f"Ker{i}", phone_number=f"07{i:08d}", email=f"worker{i}@check.test",
+                date_of_birth=datetime(1990, 1, 1), hashed_password="x", district="Gasabo"
+            )
+            for i in range(ROWS)
+        ]
+        db.add_all(jobs + users)
+        db.flush()
+
+        db.add_all(Application(user_id=users[0].id, job_id=job.id, status="accepted") for job in jobs)
+        db.add_all(
+            Application(user_id=user.id, job_id=jobs[0].id, status="accepted" if user is users[1] else "pending")
+            for user in users[1:]
+        )
+        db.add_all(
+            WorkSession(
+                user_id=users[0].id, job_id=job.id, employer_id=employer.id, daily_payment=5000,
+                start_approved=True, work_started=True, work_ended=True, end_approved=True, state="completed"
+            )
+            for job in jobs
+        )
+        db.commit()
+
+        return {
+            "employer": bearer(employer.id, "employer"),
+            "worker": bearer(users[0].id, "user"),
+            "new_worker": bearer(users[1].id, "user"),
+            "job_id": jobs[0].id
+        }
+
+
+def page_cases(data):
+    """(name, url, headers, expected statements or None for only constant)"""
+
+    yield "get_my_applications", "/api/v1/applications/my-applications", data["worker"], None
+    yield "get_job_applications", f"/api/v1/applications/job/{data['job_id']}", data["employer"], None
+    yield "get_my_work_sessions", "/api/v1/work-sessions/my-sessions", data["worker"], 2
+    yield "get_employer_work_sessions", "/api/v1/work-sessions/employer/sessions", data["employer"], 2
+
+
+def check_work_session_actions(client, data):
+    """Walk one session through its lifecycle; returns [(name, statements, expected)]"""
+
+    worker, employer = data["new_worker"], data["employer"]
+
+    response, count = statement_count(
+        client, "POST", "/api/v1/work-sessions", worker, json={"job_id": data["job_id"], "daily_payment": 5000}
+    )
+    results = [("create_work_session", count, 7)]
+
+    session_url = f"/api/v1/work-sessions/{response.json()['id']}"
+    for name, action, headers, body in [
+        ("approve_start_work_session", "approve-start", employer, {"approved": True}),
+        ("request_start_work_session", "request-start", worker, {}),
+        ("request_end_work_session", "request-end", worker, {}),
+        ("approve_end_work_session", "approve-end", employer, {"approved": True}),
+    ]:
+        _, count = statement_count(client, "POST", f"{session_url}/{action}", headers, json=body)
+        results.append((name, count, 4))
+
+    return results
+
+
+def main():
+    client = TestClient(app)
+    data = seed()
+
+    failed = False
+    for name, url, headers, expected in page_cases(data):
+        counts = {}
+        for size in PAGE_SIZES:
+            response, counts[size] = statement_count(client, "GET", f"{url}?limit={size}", headers)
+            if len(response.json()) != size:
+                raise SystemExit(f"{name}: expected a full page of {size}, got {len(response.json())}")
+
+        ok = len(set(counts.values())) == 1 and (expected is None or counts[PAGE_SIZES[0]] == expected)
+        summary = " ".join(f"limit={size}:{count}" for size, count in counts.items())
+        if expected is not None:
+            summary += f" (expected {expected})"
+        print(("ok   " if ok else "FAIL ") + f"{name} {summary}")
+        failed = failed or not ok
+
+    for name, count, expected in check_work_session_actions(client, data):
+        ok = count == expected
+        print(("ok   " if ok else "FAIL ") + f"{name} {count} (expected {expected})")
+        failed = failed or not ok
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    try:
+        status = main()
+    finally:
+        engine.dispose()
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+    sys.exit(status)
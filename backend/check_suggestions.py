@@ -0,0 +1,105 @@
+"""Ranking check for the job title typeahead (SuggestIndex).
+
+Builds the index from a scratch SQLite database holding many one-off titles
+plus one very popular title, and exits non-zero if the popular title and
+its category are not ranked first for a short prefix, for a longer prefix
+or after job changes move the counts, or if any lookup disagrees with a
+brute-force ranking of every label.
+
+    python check_suggestions.py
+"""
+import os
+import sys
+from collections import namedtuple
+
+os.environ.setdefault("SECRET_KEY", "suggestion-check")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.job import Job
+from app.core.suggest import SuggestIndex, normalize
+
+ONE_OFF_TITLES = 2000
+POPULAR_JOBS = 3000
+
+JobRow = namedtuple("JobRow", "title category status")
+
+
+def seed(db):
+    rows = [
+        dict(id=f"painter-{i}", title=f"Painter wanted {i}", category="Painting & Decoration")
+        for i in range(ONE_OFF_TITLES)
+    ] + [
+        dict(id=f"plumber-{i}", title="Plumber needed", category="Plumbing & Electrical")
+        for i in range(POPULAR_JOBS)
+    ]
+    db.execute(insert(Job), [
+        dict(row, slug=row["id"], description="Suggestion check job", district="Gasabo",
+             salary=5000, status="active", employer_id="employer-id")
+        for row in rows
+    ])
+    db.commit()
+
+
+def brute_force(index, prefix, limit):
+    """Every label with a word starting with prefix, ranked from scratch"""
+
+    prefix = normalize(prefix)
+    matches = [
+        (-count, len(label), label, kind)
+        for (kind, key), (label, count) in index._labels.items()
+        if any(suffix.startswith(prefix) for suffix in (" ".join(key.split(" ")[i:]) for i in range(len(key.split(" ")))))
+    ]
+    return [(label, -count) for count, _, label, _ in sorted(matches)[:limit]]
+
+
+def top(index, prefix, limit):
+    return [(item["label"], item["count"]) for item in index.suggest(prefix, limit)]
+
+
+def cases(index):
+    yield "short prefix ranks by count", top(index, "p", 3), [
+        ("Plumber needed", POPULAR_JOBS),
+        ("Plumbing & Electrical", POPULAR_JOBS),
+        ("Painting & Decoration", ONE_OFF_TITLES),
+    ]
+    # The category sorts after every "painter wanted" suffix, so a capped scan would miss it
+    yield "long prefix ranks every match", top(index, "pain", 1), [("Painting & Decoration", ONE_OFF_TITLES)]
+
+    index.apply_changes([(f"plumber-{i}", JobRow("Plumber needed", "Plumbing & Electrical", "closed")) for i in range(2500)])
+    index.apply_changes([("painter-0", None)])
+    yield "counts follow job changes", top(index, "p", 3), [
+        ("Painting & Decoration", ONE_OFF_TITLES - 1),
+        ("Plumber needed", POPULAR_JOBS - 2500),
+        ("Plumbing & Electrical", POPULAR_JOBS - 2500),
+    ]
+
+    for prefix in ["p", "pl", "pai", "w", "wan", "1", "plumbing", "needed", "wanted 19"]:
+        yield f"'{prefix}' matches brute force", top(index, prefix, 5), brute_force(index, prefix, 5)
+
+
+def main():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+
+    index = SuggestIndex()
+    index.ensure_built(db)
+
+    failed = False
+    for name, got, expected in cases(index):
+        ok = got == expected
+        print(("ok   " if ok else "FAIL ") + name)
+        if not ok:
+            failed = True
+            print(f"       expected {expected}")
+            print(f"       got      {got}")
+
+    db.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())